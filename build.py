@@ -4,7 +4,7 @@ Build script to create a portable EXE using PyInstaller.
 Usage:
     python build.py
 
-This will create an executable in the 'dist' directory.
+This will create an application folder in the 'dist' directory.
 """
 
 import subprocess
@@ -13,8 +13,34 @@ import os
 from pathlib import Path
 
 
+def prebuild_thumbnails():
+    """Pre-render illustration thumbnails so the app can show them without resizing."""
+    try:
+        from PIL import Image
+    except ImportError:
+        print("✗ Pillow is not installed, skipping illustration thumbnails")
+        return
+    
+    from ui.illustrations import THUMBNAIL_SIZE, get_images_dir, get_thumbnails_dir
+    
+    images_dir = get_images_dir()
+    thumbs_dir = get_thumbnails_dir(images_dir)
+    thumbs_dir.mkdir(exist_ok=True)
+    
+    count = 0
+    for image_path in sorted(images_dir.glob("*.png")):
+        with Image.open(image_path) as img:
+            img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+            # The line drawings use few colours; a 256-colour palette keeps
+            # them visually identical at a fraction of the size
+            img = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+            img.save(thumbs_dir / image_path.name, optimize=True)
+        count += 1
+    print(f"✓ Pre-rendered {count} illustration thumbnails")
+
+
 def build_exe():
-    """Build the FaceMilling application to a portable EXE."""
+    """Build the FaceMilling application to a portable application folder."""
     
     print("Building FaceMilling Application...")
     print("=" * 60)
@@ -28,10 +54,12 @@ def build_exe():
         print("  Install it with: pip install pyinstaller")
         sys.exit(1)
     
+    prebuild_thumbnails()
+    
     # Build command
     build_cmd = [
         "pyinstaller",
-        "--onefile",                    # Single executable file
+        "--onedir",                     # Unpacked folder, no extraction on every launch
         "--windowed",                   # No console window
         "--name", "FaceMilling",        # Application name
         "--add-data", "config.json:.",  # Include config file
@@ -47,9 +75,9 @@ def build_exe():
         
         print("-" * 60)
         print("✓ Build completed successfully!")
-        print("\nThe executable has been created in the 'dist' directory:")
-        print("  dist/FaceMilling.exe")
-        print("\nYou can now distribute this file separately from the source code.")
+        print("\nThe application has been created in the 'dist' directory:")
+        print("  dist/FaceMilling/FaceMilling.exe")
+        print("\nYou can now distribute the dist/FaceMilling folder separately from the source code.")
         print("The config.json and assets folders can be included for customization.")
         
     except subprocess.CalledProcessError as e:
@@ -3,11 +3,20 @@ Configuration management for FaceMilling application.
 Handles loading and saving settings from/to config file.
 """
 
+import copy
 import json
 import sys
 import os
+import stat
+import tempfile
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Default configuration values
 DEFAULT_CONFIG = {
@@ -75,16 +84,32 @@ DEFAULT_CONFIG = {
 }
 
 
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
 class ConfigManager:
     """Manages application configuration."""
     
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", create_if_missing: bool = True):
         """
         Initialize config manager.
         
         Args:
             config_file: Path to the configuration file
+            create_if_missing: Write the loaded config out if no config file exists yet
         """
+        self.create_if_missing = create_if_missing
         # Resolve config file path - support both dev and exe environments
         self._bundled_path = None
         if getattr(sys, 'frozen', False):
@@ -106,55 +131,90 @@ class ConfigManager:
                 self.config_file = Path(__file__).parent / config_file
         
         self.config: Dict[str, Any] = {}
+        # (modification time in ns, size) of config_file when it was last loaded/saved
+        self._file_stamp: Optional[Tuple[int, int]] = None
         self.load_config()
     
+    def _get_file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return the config file (modification time in ns, size), or None if it does not exist."""
+        try:
+            st = self.config_file.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
     def load_config(self) -> None:
-        """Load configuration from file or use defaults."""
+        """
+        Load configuration from file or use defaults.
+        
+        Called again to pick up edits to the config file (the UI does so on
+        Reset); the file is only re-read when its modification time or size
+        has changed since the last load or save. The size catches a rewrite
+        within the file system's timestamp resolution.
+        """
+        stamp = self._get_file_stamp()
+        if stamp is not None and stamp == self._file_stamp and self.config:
+            return
+        self._file_stamp = stamp
+        
         # If running frozen, prefer bundled config, but allow external override
         if getattr(sys, 'frozen', False):
             # Load bundled config if available
-            if self._bundled_path and self._bundled_path.exists():
+            if self._bundled_path:
                 try:
-                    with open(self._bundled_path, 'r', encoding='utf-8') as f:
-                        self.config = json.load(f)
+                    self.config = _loads(self._bundled_path.read_bytes())
                 except Exception:
-                    self.config = DEFAULT_CONFIG.copy()
+                    self.config = copy.deepcopy(DEFAULT_CONFIG)
             else:
-                self.config = DEFAULT_CONFIG.copy()
+                self.config = copy.deepcopy(DEFAULT_CONFIG)
 
             # If an external config exists next to the exe, use it to override
-            if self.config_file.exists():
-                try:
-                    with open(self.config_file, 'r', encoding='utf-8') as f:
-                        external = json.load(f)
-                        # Merge external over loaded config
-                        if isinstance(external, dict):
-                            self.config.update(external)
-                except Exception:
-                    # Ignore external load errors and keep bundled/default config
-                    pass
-            else:
+            try:
+                external = _loads(self.config_file.read_bytes())
+            except FileNotFoundError:
                 # No external config yet: write the loaded (bundled/default) config out
-                try:
-                    self.save_config()
-                except Exception:
-                    pass
-        else:
-            if self.config_file.exists():
-                try:
-                    with open(self.config_file, 'r', encoding='utf-8') as f:
-                        self.config = json.load(f)
-                except Exception:
-                    self.config = DEFAULT_CONFIG.copy()
+                if self.create_if_missing:
+                    try:
+                        self.save_config()
+                    except Exception:
+                        pass
+            except Exception:
+                # Ignore external load errors and keep bundled/default config
+                pass
             else:
-                self.config = DEFAULT_CONFIG.copy()
-                self.save_config()
+                # Merge external over loaded config
+                if isinstance(external, dict):
+                    self.config.update(external)
+        else:
+            try:
+                self.config = _loads(self.config_file.read_bytes())
+            except FileNotFoundError:
+                self.config = copy.deepcopy(DEFAULT_CONFIG)
+                if self.create_if_missing:
+                    self.save_config()
+            except Exception:
+                self.config = copy.deepcopy(DEFAULT_CONFIG)
     
     def save_config(self) -> None:
-        """Save current configuration to file."""
+        """Save current configuration to file atomically."""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            data = _dumps(self.config)
+            # Write to a temp file in the same directory, then swap it in so a
+            # crash mid-write never leaves a truncated config behind
+            fd, tmp_path = tempfile.mkstemp(dir=self.config_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                # mkstemp creates the file as 0600; keep the existing file's mode
+                try:
+                    os.chmod(tmp_path, stat.S_IMODE(os.stat(self.config_file).st_mode))
+                except FileNotFoundError:
+                    pass
+                os.replace(tmp_path, self.config_file)
+                self._file_stamp = self._get_file_stamp()
+            except Exception:
+                os.unlink(tmp_path)
+                raise
         except Exception as e:
             pass
     
@@ -1,3 +1,9 @@
 """
 GCode module for FaceMilling application.
 """
+
+from gcode.generator import GCodeGenerator, generate_gcode
+from gcode.path_calculator import SpiralPathCalculator
+from gcode.validator import InputValidator
+
+__all__ = ["GCodeGenerator", "generate_gcode", "SpiralPathCalculator", "InputValidator"]
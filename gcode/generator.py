@@ -3,7 +3,8 @@ G-code generator for FaceMilling operations.
 Handles conversion of input parameters to CNC G-code programs.
 """
 
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Iterable, Iterator, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
@@ -11,6 +12,35 @@ from gcode.validator import InputValidator
 from gcode.path_calculator import SpiralPathCalculator
 
 
+# Precompiled line formatters for the per-point loop.
+# XY and arc radius are already rounded to 0.1mm by the path calculator,
+# Z is emitted with the same 3-decimal precision used in the header.
+_FMT_G0 = "G0 X{:.1f} Y{:.1f}\n".format
+_FMT_PLUNGE = "G1 Z{:.3f} F{}\n".format
+_FMT_DEPTH = "(Depth: {:.3f}mm)\n".format
+_FMT_G1_FEED = "G1 X{:.1f} Y{:.1f} F{}\n".format
+_FMT_G1 = "G1 X{:.1f} Y{:.1f}\n".format
+_FMT_G2 = "G2 X{:.1f} Y{:.1f} R{:.1f}\n".format
+
+_HEADER_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_FOOTER = """\nG49
+G28 G91 Z0
+G28 G91 X0 Y0
+M30
+%
+"""
+
+# Work offset selected for each position reference.
+# Table mode writes the table offset into G55 in the header.
+_REF_TO_GCODE = {
+    "Table": "G55\n",
+    "G55": "G55\n",
+    "G56": "G56\n",
+    "G57": "G57\n",
+}
+
+
 class GCodeGenerator:
     """Generates G-code programs from facemilling parameters."""
     
@@ -18,245 +48,232 @@ class GCodeGenerator:
         """Initialize the G-code generator."""
         pass
     
-    def generate_program(self, parameters: Dict[str, Any]) -> str:
+    def generate_program(self, parameters: Dict[str, Any], *, validate: bool = True) -> str:
         """
         Generate G-code program from input parameters.
         
         Args:
             parameters: Dictionary containing all input parameters
                        organized by section (position, stock, roughing, finishing)
+            validate: Run InputValidator first. Pass False only if the caller
+                      has already validated the same parameters.
         
         Returns:
             G-code program as string
             
+        Raises:
+            ValueError: If validation fails
+        """
+        return "".join(self.generate_program_stream(parameters, validate=validate))
+    
+    def generate_program_stream(self, parameters: Dict[str, Any], *,
+                                validate: bool = True) -> Iterator[str]:
+        """
+        Generate G-code program from input parameters as a stream of chunks.
+        
+        Validation runs immediately; the toolpath is then emitted one depth
+        level at a time so it can be written out without building the whole
+        program in memory.
+        
+        Args:
+            parameters: Dictionary containing all input parameters
+                       organized by section (position, stock, roughing, finishing)
+            validate: Run InputValidator first. Pass False only if the caller
+                      has already validated the same parameters.
+        
+        Returns:
+            Iterator of G-code text chunks
+            
         Raises:
             ValueError: If validation fails
         """
         # Validate all inputs first
-        is_valid, error_msg = InputValidator.validate(parameters)
-        if not is_valid:
-            raise ValueError(f"Validation failed: {error_msg}")
+        if validate:
+            is_valid, error_msg = InputValidator.validate(parameters)
+            if not is_valid:
+                raise ValueError(f"Validation failed: {error_msg}")
         
         # Create path calculator and generate paths
         calculator = SpiralPathCalculator(parameters)
         
-        # For now, build the program with structure
-        gcode_output = self._create_header(parameters)
-        gcode_output += self._create_program_body(parameters, calculator)
-        gcode_output += self._create_footer()
-        
-        return gcode_output
+        return self._iter_program(parameters, calculator)
     
-    def _create_header(self, parameters: Dict[str, Any]) -> str:
+    @staticmethod
+    def _iter_program(parameters: Dict[str, Any], calculator: SpiralPathCalculator) -> Iterator[str]:
+        """Yield header, body and footer chunks of the G-code program."""
+        yield GCodeGenerator._create_header(parameters)
+        yield from GCodeGenerator._create_program_body(parameters, calculator)
+        yield GCodeGenerator._create_footer()
+    
+    @staticmethod
+    def _create_header(parameters: Dict[str, Any]) -> str:
         """Create the header section of the G-code program."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = datetime.now().strftime(_HEADER_TIMESTAMP_FORMAT)
         stock = parameters["stock"]
         position = parameters["position"]
-        machine_settings = parameters["machine_settings"]
+        stock_x = stock["x_size"]
+        stock_y = stock["y_size"]
+        stock_z = stock["z_size"]
+        finished_z = stock["finished_z_height"]
         
         header = f"""(*******************************)
 (======FaceMilling Program======)
 (===Date: {timestamp}===)
 (*******************************)
 (==========Stock Size===========)
-(X={stock.get('x_size', 0)}mm, Y={stock.get('y_size', 0)}mm, Z={stock.get('z_size', 0)}mm)
+(X={stock_x}mm, Y={stock_y}mm, Z={stock_z}mm)
 (*******************************)
-(======Finished Z: {stock.get('finished_z_height', 0)}mm======)
+(======Finished Z: {finished_z}mm======)
 (*******************************)
 
 """
         
         # Add position offset block if using Table reference
-        if position["reference"] == "Table":
-            table_x = machine_settings["table_reference_x"]
-            table_y = machine_settings["table_reference_y"]
-            table_z = machine_settings["table_reference_z"]
-            offset_x = table_x + position["x"]
-            offset_y = table_y + position["y"]
-            
-            header += f"""(Setting G55 according to table offset)
+        if position["reference"] != "Table":
+            return header
+
+        machine_settings = parameters["machine_settings"]
+        offset_x = machine_settings["table_reference_x"] + position["x"]
+        offset_y = machine_settings["table_reference_y"] + position["y"]
+        table_z = machine_settings["table_reference_z"]
+        
+        # Table offset into G55, followed by the initial reference return
+        return header + f"""(Setting G55 according to table offset)
 #5241 = {round(offset_x, 3)}
 #5242 = {round(offset_y, 3)}
 #5243 = {round(table_z, 3)}
 
+G28 G91 Z0
+
 """
-            # Initial refrence return
-            header += f"G28 G91 Z0\n\n"
-        
-        return header
-    def _create_program_body(self, parameters: Dict[str, Any], calculator: SpiralPathCalculator) -> str:
+
+    @staticmethod
+    def _create_program_body(parameters: Dict[str, Any], calculator: SpiralPathCalculator) -> Iterator[str]:
         """Create the main body of the G-code program."""
-        output = ""
+        # Coolant ON/OFF blocks are identical for both sections
+        coolant_dict = parameters.get("coolant", {})
+        coolant = (
+            "".join(f"M{m_codes['on_code']} (Turn on {name})\n" for name, m_codes in coolant_dict.items()),
+            "".join(f"M{m_codes['off_code']} (Turn off {name})\n" for name, m_codes in coolant_dict.items()),
+        )
         
         # Roughing operation
         if not parameters["only_finish"]:
-            output += self._create_roughing_section(parameters, calculator)
+            yield from GCodeGenerator._create_section(parameters, calculator, coolant, is_roughing=True)
         
         # Finishing operation
         if "leave_for_finishing" not in parameters["roughing"]:
             raise ValueError("Missing 'leave_for_finishing' in roughing parameters")
         leave = parameters["roughing"]["leave_for_finishing"]
         if leave != 0:
-            output += self._create_finishing_section(parameters, calculator)
-        
-        return output
+            yield from GCodeGenerator._create_section(parameters, calculator, coolant, is_roughing=False)
     
-    def _create_roughing_section(self, parameters: Dict[str, Any], calculator: SpiralPathCalculator) -> str:
-        """Create roughing operation section."""
-        output = ""
-        roughing = parameters["roughing"]
-        refrence = parameters["position"]["reference"]
-
-        output += "\nN1 (Roughing)\n"
-        output += f"M06 T{roughing['tool_number']}\n"
-
-        if refrence == "Table":
-            output += f"G55\n"
-        elif refrence == "G55":
-            output += f"G55\n"
-        elif refrence == "G56":
-            output += f"G56\n"
-        elif refrence == "G57":
-            output += f"G57\n"
-        
-        output += f"G5.1 Q1 R3\n" # Enable semi-precision contouring mode
-        output += f"G0 G90 B0 C0\n" # Initial ensure B & C axes are zeroed
-        output += f"M32 (Clamp C)\nM34 (Clamp B)\n"
-        output += f"M3 S{roughing['rpm']}\n"
-
+    @staticmethod
+    def _create_section(parameters: Dict[str, Any], calculator: SpiralPathCalculator,
+                        coolant: Tuple[str, str], is_roughing: bool) -> Iterator[str]:
+        """
+        Create a roughing or finishing operation section, one chunk per depth level.
         
-        # Calculate spiral passes
-        depth_levels = calculator.calculate_spiral_passes(is_roughing=True)
+        Args:
+            parameters: Dictionary containing all input parameters
+            calculator: Path calculator for the spiral toolpaths
+            coolant: Preformatted (ON, OFF) coolant M-code blocks
+            is_roughing: True for the roughing section, False for finishing
+        """
+        coolant_on, coolant_off = coolant
+        parts = []
+        append = parts.append
+        tool = parameters["roughing"] if is_roughing else parameters["finishing"]
+        reference = parameters["position"]["reference"]
 
-        # Get rapid position and clearance
-        rapid_x = depth_levels[0].passes[0][0].x
-        rapid_y = depth_levels[0].passes[0][0].y
-        clearance = calculator.get_total_clearance_height()
+        if is_roughing:
+            append("\nN1 (Roughing)\n")
+        else:
+            append("\nN2 (Finishing)\n")
+            append("M1\n")  # Optional stop for tool change
+        append(f"M06 T{tool['tool_number']}\n")
+        append(_REF_TO_GCODE[reference])
         
-        output += f"G0 X{rapid_x} Y{rapid_y}\n"
-        output += f"G43 H{roughing['tool_number']} Z{clearance}\n"
-        
-        # Add coolant ON codes
-        coolant_dict = parameters.get("coolant", {})
-        for coolant_name, m_codes in coolant_dict.items():
-            output += f"M{m_codes['on_code']} (Turn on {coolant_name})\n"
-        
-        
-        for level in depth_levels:
-            output += f"(Depth: {level.z_depth}mm)\n"
-            for pass_num, pass_points in enumerate(level.passes):
-                for i, point in enumerate(pass_points):
-                    if i == 0:
-                        output += f"G0 X{point.x} Y{point.y}\n"
-                        output += f"G1 Z{point.z} F{point.feed}\n" # Plunge to depth at plunge-feedrate
-                    elif i == 1:
-                        output += f"G1 X{point.x} Y{point.y} F{point.feed}\n" # First move after plunge, ensure feedrate is set
-                    else:
-                        if point.arc:
-                            output += f"G2 X{point.x} Y{point.y} R{point.arc_radius}\n"
-                        else:
-                            output += f"G1 X{point.x} Y{point.y}\n"
-            output += f"G0 Z{clearance}\n"
-        
-        # Add coolant OFF codes
-        for coolant_name, m_codes in coolant_dict.items():
-            output += f"M{m_codes['off_code']} (Turn off {coolant_name})\n"
+        # Enable semi-precision contouring mode (R3 roughing, R5 finishing)
+        append("G5.1 Q1 R3\n" if is_roughing else "G5.1 Q1 R5\n")
+        append(f"G0 G90 B0 C0\n") # Initial ensure B & C axes are zeroed
+        append(f"M32 (Clamp C)\nM34 (Clamp B)\n")
+        append(f"M3 S{tool['rpm']}\n")
         
-        output += "M5\n"
-        output += f"G49\n"
-        output += "G28 G91 Z0\n"
-        return output
-    
-    def _create_finishing_section(self, parameters: Dict[str, Any], calculator: SpiralPathCalculator) -> str:
-        """Create finishing operation section."""
-        output = ""
-        finishing = parameters["finishing"]
-        refrence = parameters["position"]["reference"]
-
-        output += "\nN2 (Finishing)\n"
-        output += "M1\n"  # Optional stop for tool change
-        output += f"M06 T{finishing['tool_number']}\n"
-        if refrence == "Table":
-            output += f"G55\n"
-        elif refrence == "G55":
-            output += f"G55\n"
-        elif refrence == "G56":
-            output += f"G56\n"
-        elif refrence == "G57":
-            output += f"G57\n"
-
-        output += f"G5.1 Q1 R5\n" # Enable semi-precision contouring mode
-        output += f"G0 G90 B0 C0\n" # Initial ensure B & C axes are zeroed
-        output += f"M32 (Clamp C)\nM34 (Clamp B)\n"
-        output += f"M3 S{finishing['rpm']}\n"
-        
-        # Calculate spiral passes (single pass for finishing)
-        depth_levels = calculator.calculate_spiral_passes(is_roughing=False)
+        # Calculate spiral passes (single depth level for finishing)
+        depth_levels = calculator.calculate_spiral_passes(is_roughing=is_roughing)
 
         # Get rapid position and clearance
         rapid_x = depth_levels[0].passes[0][0].x
         rapid_y = depth_levels[0].passes[0][0].y
         clearance = calculator.get_total_clearance_height()
         
-        output += f"G0 X{rapid_x} Y{rapid_y}\n"
-        output += f"G43 H{finishing['tool_number']} Z{clearance}\n"
+        append(f"G0 X{rapid_x} Y{rapid_y}\n")
+        append(f"G43 H{tool['tool_number']} Z{clearance}\n")
         
         # Add coolant ON codes
-        coolant_dict = parameters.get("coolant", {})
-        for coolant_name, m_codes in coolant_dict.items():
-            output += f"M{m_codes['on_code']} (Turn on {coolant_name})\n"
-        
+        append(coolant_on)
         
+        fmt_g1 = _FMT_G1
+        fmt_g2 = _FMT_G2
         for level in depth_levels:
-            for pass_num, pass_points in enumerate(level.passes):
-                for i, point in enumerate(pass_points):
-                    if i == 0:
-                        output += f"G0 X{point.x} Y{point.y}\n"
-                        output += f"G1 Z{point.z} F{point.feed}\n" # Plunge to depth at plunge-feedrate
-                    elif i == 1:
-                        output += f"G1 X{point.x} Y{point.y} F{point.feed}\n" # First move after plunge, ensure feedrate is set
-                    else:
-                        if point.arc:
-                            # G2 is clockwise arc
-                            output += f"G2 X{point.x} Y{point.y} R{point.arc_radius}\n"
-                        else:
-                            output += f"G1 X{point.x} Y{point.y}\n"
-        
-        output += f"G0 Z{clearance}\n"
+            if is_roughing:
+                append(_FMT_DEPTH(level.z_depth))
+            for pass_points in level.passes:
+                # Rapid to start, then plunge to depth at plunge-feedrate
+                first = pass_points[0]
+                append(_FMT_G0(first.x, first.y))
+                append(_FMT_PLUNGE(level.z_depth, first.feed))
+                if len(pass_points) > 1:
+                    # First move after plunge, ensure feedrate is set
+                    second = pass_points[1]
+                    append(_FMT_G1_FEED(second.x, second.y, second.feed))
+                # Remaining moves: G2 is clockwise arc, G1 straight line
+                parts.extend([
+                    fmt_g2(p.x, p.y, p.arc_radius) if p.arc else fmt_g1(p.x, p.y)
+                    for p in pass_points[2:]
+                ])
+            append(f"G0 Z{clearance}\n")
+            yield "".join(parts)
+            parts.clear()
         
         # Add coolant OFF codes
-        for coolant_name, m_codes in coolant_dict.items():
-            output += f"M{m_codes['off_code']} (Turn off {coolant_name})\n"
+        append(coolant_off)
         
-        output += "M5\n"
-        return output
+        append("M5\n")
+        if is_roughing:
+            append(f"G49\n")
+            append("G28 G91 Z0\n")
+        yield "".join(parts)
     
-    def _create_footer(self) -> str:
+    @staticmethod
+    def _create_footer() -> str:
         """Create the footer section of the G-code program."""
-        footer = """\nG49
-G28 G91 Z0
-G28 G91 X0 Y0
-M30
-%
-"""
-        return footer
+        return _FOOTER
     
-    def save_program(self, program: str, filename: str) -> bool:
+    def save_program(self, program: Union[str, Iterable[str]], filename: str) -> bool:
         """
         Save G-code program to file without extension.
         
         Args:
-            program: G-code program string
+            program: G-code program string, or an iterable of chunks
+                     such as the one returned by generate_program_stream()
             filename: Output filename (without extension)
             
         Returns:
-            True if successful, False otherwise
+            True if successful, False if the file could not be written
+            
+        Raises:
+            Any error raised while generating a streamed program; only
+            file system errors are reported through the return value
         """
         try:
-            # Remove any extension if provided
-            base = filename
-            if '.' in filename:
-                base = filename.split('.')[0]
+            # Remove any extension if provided; an empty name has none to remove
+            path = Path(filename)
+            if not path.name:
+                print(f"Error saving G-code program: invalid file name {filename!r}")
+                return False
+            base = path.with_suffix('')
 
             # If output_dir provided as attribute, use it; otherwise current dir
             output_dir = getattr(self, 'output_dir', None)
@@ -269,12 +286,23 @@ M30
             if out_path.parent and not out_path.parent.exists():
                 out_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(out_path, 'w') as f:
-                f.write(program)
+            # Write to a temp file first so a failure while streaming never
+            # leaves a truncated program behind
+            tmp_path = out_path.with_name(out_path.name + ".tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    if isinstance(program, str):
+                        f.write(program)
+                    else:
+                        f.writelines(program)
+                os.replace(tmp_path, out_path)
+            except Exception:
+                tmp_path.unlink(missing_ok=True)
+                raise
 
             print(f"G-code program saved to: {out_path}")
             return True
-        except Exception as e:
+        except OSError as e:
             print(f"Error saving G-code program: {e}")
             return False
 
@@ -289,5 +317,8 @@ def generate_gcode(parameters: Dict[str, Any]) -> str:
     Returns:
         G-code program as string
     """
-    generator = GCodeGenerator()
-    return generator.generate_program(parameters)
+    return _GENERATOR.generate_program(parameters)
+
+
+# Shared stateless instance used by generate_gcode()
+_GENERATOR = GCodeGenerator()
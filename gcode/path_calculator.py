@@ -3,27 +3,37 @@ Spiral milling path calculator.
 Computes toolpaths for face milling operations using rectangular spiral strategy.
 """
 
-from typing import Dict, Any, List, Tuple
+import math
+from typing import Dict, Any, List, Sequence, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ToolPathPoint:
-    """Represents a point in the toolpath."""
+    """
+    Represents a point in the toolpath (Z is stored on the DepthLevel).
+    
+    Points are immutable since memoized spirals are shared between callers.
+    """
     x: float
     y: float
-    z: float
     feed: int = 0
     rapid: bool = False
     arc: bool = False  # True if this point is an arc endpoint
     arc_radius: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class DepthLevel:
-    """Represents all passes at a particular depth."""
+    """
+    Represents all passes at a particular depth.
+    
+    The XY path is the same at every depth, so all levels of one
+    calculate_spiral_passes() call share the same point lists.
+    """
     z_depth: float
-    passes: List[List[ToolPathPoint]]
+    passes: List[Sequence[ToolPathPoint]]
 
 
 class SpiralPathCalculator:
@@ -103,86 +113,118 @@ class SpiralPathCalculator:
             plunge_feedrate = self.machine_settings["plunge_feedrate"]
             depth_of_cut = start_z - end_z
         
-        # Calculate depth levels
-        depth_levels = []
-        current_z = start_z
-        
-        while current_z > end_z:
-            next_z = max(current_z - depth_of_cut, end_z)
-            depth_levels.append(next_z)
-            current_z = next_z
+        # Calculate depth levels in closed form; the last level is clamped to end_z.
+        # The small tolerance stops float noise (e.g. 8.75 / 1.25) adding an extra level.
+        if start_z > end_z:
+            level_count = math.ceil((start_z - end_z) / depth_of_cut - 1e-9)
+        else:
+            level_count = 0
+        depth_levels = [
+            max(start_z - depth_of_cut * i, end_z) for i in range(1, level_count + 1)
+        ]
+        if depth_levels:
+            # Land exactly on end_z, not a few ulps above it
+            depth_levels[-1] = end_z
         
-        # For each depth level, generate complete spiral
-        all_spirals = []
-        for z_depth in depth_levels:
-            spiral_points = self._generate_rectangular_spiral(
-                tool_radius, width_of_cut, z_depth, feedrate, plunge_feedrate, is_roughing, last_cut_overlap=self.last_cut_overlap
-            )
-            # Wrap in DepthLevel with passes as list of point lists
-            all_spirals.append(DepthLevel(
-                z_depth=z_depth,
-                passes=[spiral_points]  # Single spiral is one "pass" containing all points
-            ))
+        # The spiral does not depend on depth: generate it once and share it
+        spiral_points = self._generate_rectangular_spiral(
+            tool_radius, width_of_cut, feedrate, plunge_feedrate, is_roughing, last_cut_overlap=self.last_cut_overlap
+        )
+        # Single spiral is one "pass" containing all points
+        passes = [spiral_points]
         
-        return all_spirals
+        return [DepthLevel(z_depth=z_depth, passes=passes) for z_depth in depth_levels]
     
     def _generate_rectangular_spiral(
         self,
         tool_radius: float,
         width_of_cut: float,
-        z_depth: float,
         feedrate: int,
         plunge_feedrate: int,
         is_roughing: bool,
         last_cut_overlap: float
-    ) -> List[ToolPathPoint]:
+    ) -> Sequence[ToolPathPoint]:
         """
-        Generate a complete rectangular spiral at one depth using simple loop logic.
-        Clockwise spiral: UP, RIGHT, DOWN (short), LEFT to next lap, repeat.
+        Generate a complete rectangular spiral (XY only).
+        Results are cached, so regenerating with unchanged geometry is free.
         
         Args:
             tool_radius: Tool radius in mm
             width_of_cut: Maximum width of cut per pass (stepover)
-            z_depth: Z depth for this spiral
             feedrate: Feed rate for spiral moves
             is_roughing: True for roughing (affects starting position)
             
         Returns:
-            List of ToolPathPoints representing the complete spiral
+            Tuple of ToolPathPoints representing the complete spiral
+        """
+        # Table mode offsets are applied in G-code header, not here
+        if self.position_reference != "Table":
+            x_offset, y_offset = self.position_x_offset, self.position_y_offset
+        else:
+            x_offset, y_offset = 0.0, 0.0
+        return SpiralPathCalculator._build_rectangular_spiral(
+            self.stock_x, self.stock_y, self.stock_offset, x_offset, y_offset,
+            self.corner_radius, self.lead_in, tool_radius, width_of_cut,
+            feedrate, plunge_feedrate, last_cut_overlap
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _build_rectangular_spiral(
+        stock_x: float,
+        stock_y: float,
+        stock_offset: float,
+        x_offset: float,
+        y_offset: float,
+        corner_radius: float,
+        lead_in: float,
+        tool_radius: float,
+        width_of_cut: float,
+        feedrate: int,
+        plunge_feedrate: int,
+        last_cut_overlap: float
+    ) -> Tuple[ToolPathPoint, ...]:
+        """
+        Build a rectangular spiral using simple loop logic.
+        Clockwise spiral: UP, RIGHT, DOWN (short), LEFT to next lap, repeat.
+        
+        Every input that shapes the path is an argument so results can be
+        memoized; the returned points are shared and must not be modified.
+        
+        Returns:
+            Tuple of ToolPathPoints representing the complete spiral
         """
         points = []
+        # Local aliases for the per-point loop
+        add = points.append
+        Point = ToolPathPoint
         
         # Work area bounds
-        x_min = -self.stock_offset
-        y_min = -self.stock_offset
-        x_max = self.stock_x + self.stock_offset
-        y_max = self.stock_y + self.stock_offset
+        x_min = -stock_offset
+        y_min = -stock_offset
+        x_max = stock_x + stock_offset
+        y_max = stock_y + stock_offset
         
         # Stock left to machine
         x_stock_left = x_max - x_min
         y_stock_left = y_max - y_min
 
-        # Apply position offsets for G55/G56/G57 modes
-        # Table mode offsets are applied in G-code header, not here
-        if self.position_reference != "Table":
-            x_min += self.position_x_offset
-            y_min += self.position_y_offset
-            x_max += self.position_x_offset
-            y_max += self.position_y_offset
+        # Apply position offsets for G55/G56/G57 modes (zero in Table mode)
+        x_min += x_offset
+        y_min += y_offset
+        x_max += x_offset
+        y_max += y_offset
         
         # Get corner radius
-        corner_r = float(self.corner_radius)
+        corner_r = float(corner_radius)
         
         # Calculate optimal stepover
-        stepover = self._calculate_stepover(x_min, y_min, x_max, y_max, width_of_cut, last_cut_overlap)
+        stepover = SpiralPathCalculator._calculate_stepover(x_min, y_min, x_max, y_max, width_of_cut, last_cut_overlap)
         
         # Rapid approach from outside
-        start_x = x_max + self.lead_in + tool_radius
+        start_x = x_max + lead_in + tool_radius
         start_y = y_min - tool_radius + stepover
-        points.append(ToolPathPoint(
-            x=round(start_x, 1), y=round(start_y, 1), z=z_depth,
-            feed=plunge_feedrate, rapid=True
-        ))
+        add(Point(round(start_x, 1), round(start_y, 1), feed=plunge_feedrate, rapid=True))
         
         
         # Starting position for first lap
@@ -192,19 +234,13 @@ class SpiralPathCalculator:
         current_y_max = y_max + tool_radius
 
         # Feed to bottom-left corner of first lap
-        points.append(ToolPathPoint(
-            x=round(current_x_min + stepover + corner_r, 1), y=round(current_y_min + stepover, 1), z=z_depth,
-            feed=feedrate, rapid=False
-        ))
+        add(Point(round(current_x_min + stepover + corner_r, 1), round(current_y_min + stepover, 1), feed=feedrate))
 
         # Stock update and extend last pass if it is the last cut
         y_stock_left -= stepover
         if y_stock_left < 0:
-            points.append(ToolPathPoint(
-                x=round(current_x_min + stepover + tool_radius, 1), y=round(current_y_min + stepover, 1), z=z_depth,
-                feed=feedrate, rapid=False
-            ))
-            return points  # finished machining stock
+            add(Point(round(current_x_min + stepover + tool_radius, 1), round(current_y_min + stepover, 1), feed=feedrate))
+            return tuple(points)  # finished machining stock
         
         spiral_stage = 1
 
@@ -218,105 +254,65 @@ class SpiralPathCalculator:
             current_y_max -= stepover
 
 
+            # Coordinates shared by two or more points of this lap, rounded once
+            x_left = round(current_x_min, 1)
+            x_right = round(current_x_max, 1)
+            x_right_r = round(current_x_max - corner_r, 1)
+            y_top = round(current_y_max, 1)
+            y_top_r = round(current_y_max - corner_r, 1)
+            y_bottom = round(current_y_min + stepover, 1)
+
             # Arc at bottom-left
-            points.append(ToolPathPoint(
-                x=round(current_x_min, 1), 
-                y=round(current_y_min + corner_r, 1), 
-                z=z_depth, feed=feedrate, arc=True, arc_radius=corner_r
-            ))
+            add(Point(x_left, round(current_y_min + corner_r, 1), feed=feedrate, arc=True, arc_radius=corner_r))
             # ===== UP the left edge =====
-            points.append(ToolPathPoint(
-                x=round(current_x_min, 1), 
-                y=round(current_y_max - corner_r, 1), 
-                z=z_depth, feed=feedrate
-            ))
+            add(Point(x_left, y_top_r, feed=feedrate))
             # Stock update and extend last pass if it is the last cut
             x_stock_left -= stepover
             if x_stock_left < 0:
-                points.append(ToolPathPoint(
-                x=round(current_x_min, 1), 
-                y=round(current_y_max + tool_radius, 1), 
-                z=z_depth, feed=feedrate
-                ))
+                add(Point(x_left, round(current_y_max + tool_radius, 1), feed=feedrate))
                 break  # finished machining stock
 
 
             # Arc at top-left
-            points.append(ToolPathPoint(
-                x=round(current_x_min + corner_r, 1), 
-                y=round(current_y_max, 1), 
-                z=z_depth, feed=feedrate, arc=True, arc_radius=corner_r
-            ))
+            add(Point(round(current_x_min + corner_r, 1), y_top, feed=feedrate, arc=True, arc_radius=corner_r))
             
             # ===== RIGHT across top =====
-            points.append(ToolPathPoint(
-                x=round(current_x_max - corner_r, 1), 
-                y=round(current_y_max, 1), 
-                z=z_depth, feed=feedrate
-            ))
+            add(Point(x_right_r, y_top, feed=feedrate))
             # Stock update and extend last pass if it is the last cut
             y_stock_left -= stepover
             if y_stock_left < 0:
-                points.append(ToolPathPoint(
-                x=round(current_x_max + tool_radius, 1), 
-                y=round(current_y_max, 1), 
-                z=z_depth, feed=feedrate
-                ))
+                add(Point(round(current_x_max + tool_radius, 1), y_top, feed=feedrate))
                 break  # finished machining stock
 
 
             # Arc at top-right
-            points.append(ToolPathPoint(
-                x=round(current_x_max, 1), 
-                y=round(current_y_max - corner_r, 1), 
-                z=z_depth, feed=feedrate, arc=True, arc_radius=corner_r
-            ))
+            add(Point(x_right, y_top_r, feed=feedrate, arc=True, arc_radius=corner_r))
 
             # ===== DOWN the right edge ====
-            points.append(ToolPathPoint(
-                    x=round(current_x_max, 1), 
-                    y=round(current_y_min + stepover + corner_r, 1), 
-                    z=z_depth, feed=feedrate
-            ))
+            add(Point(x_right, round(current_y_min + stepover + corner_r, 1), feed=feedrate))
             # Stock update and extend last pass if it is the last cut
             x_stock_left -= stepover
             if x_stock_left < 0:
-                points.append(ToolPathPoint(
-                x=round(current_x_max, 1), 
-                y=round(current_y_min - tool_radius, 1), 
-                z=z_depth, feed=feedrate
-                ))
+                add(Point(x_right, round(current_y_min - tool_radius, 1), feed=feedrate))
                 break  # finished machining stock
 
 
 
             # Arc at bottom-right
-            points.append(ToolPathPoint(
-                x=round(current_x_max - corner_r, 1), 
-                y=round(current_y_min + stepover, 1), 
-                z=z_depth, feed=feedrate, arc=True, arc_radius=corner_r
-            ))
+            add(Point(x_right_r, y_bottom, feed=feedrate, arc=True, arc_radius=corner_r))
             # ===== ACROSS the bottom =====
-            points.append(ToolPathPoint(
-                x=round(current_x_min + stepover + corner_r, 1), 
-                y=round(current_y_min + stepover, 1), 
-                z=z_depth, feed=feedrate
-            ))
+            add(Point(round(current_x_min + stepover + corner_r, 1), y_bottom, feed=feedrate))
             # Stock update and extend last pass if it is the last cut
             y_stock_left -= stepover
             if y_stock_left < 0:
-                points.append(ToolPathPoint(
-                x=round(current_x_min + stepover - tool_radius, 1), 
-                y=round(current_y_min + stepover, 1), 
-                z=z_depth, feed=feedrate
-                ))
+                add(Point(round(current_x_min + stepover - tool_radius, 1), y_bottom, feed=feedrate))
                 break  # finished machining stock
 
-        return points
+        return tuple(points)
     
 
+    @staticmethod
     def _calculate_stepover(
-        self,
         x_min: float,
         y_min: float,
         x_max: float,
@@ -335,19 +331,12 @@ class SpiralPathCalculator:
         Returns:
             Optimal stepover in mm
         """
-        width = x_max - x_min
-        height = y_max - y_min
-        
-        # Estimate number of passes needed
-        # We want stepover <= width_of_cut
-        # And ensure last pass overlaps by last_cut_overlap
-        number_of_cuts =   ((min(width, height) + last_cut_overlap) // width_of_cut) + 1
+        # Distance to cover, including the overlap on the last cut
+        span = min(x_max - x_min, y_max - y_min) + last_cut_overlap
         
-        if number_of_cuts == 0:
-            stepover = width
-        else:
-            stepover = ((min(width, height) + last_cut_overlap) / (number_of_cuts ))
-        return round(stepover, 1)
+        # Fewest cuts that keep stepover <= width_of_cut
+        number_of_cuts = max(1, math.ceil(span / width_of_cut))
+        return round(span / number_of_cuts, 1)
     
     
     def get_total_clearance_height(self) -> float:
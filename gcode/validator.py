@@ -3,7 +3,13 @@ Input validation for G-code generation.
 Ensures all parameters are valid before processing.
 """
 
-from typing import Dict, Any, Tuple
+from operator import itemgetter
+from typing import Callable, Dict, Any, Tuple, Union
+
+# Range rule: (key, min, max, error message). A str bound names another key of
+# the same section; the message is formatted with the section's values.
+_Rule = Tuple[str, float, Union[float, str], str]
+_INF = float("inf")
 
 
 class InputValidator:
@@ -27,6 +33,44 @@ class InputValidator:
     DEPTH_CUT_MIN = 0.1
     DEPTH_CUT_MAX = 100.0
     
+    # Range rules per section, checked in order by _check_rules()
+    STOCK_RULES: Tuple[_Rule, ...] = (
+        ("x_size", STOCK_SIZE_MIN, STOCK_SIZE_MAX,
+         f"Stock X size must be between {STOCK_SIZE_MIN} and {STOCK_SIZE_MAX}mm"),
+        ("y_size", STOCK_SIZE_MIN, STOCK_SIZE_MAX,
+         f"Stock Y size must be between {STOCK_SIZE_MIN} and {STOCK_SIZE_MAX}mm"),
+        ("z_size", STOCK_SIZE_MIN, STOCK_SIZE_MAX,
+         f"Stock Z size must be between {STOCK_SIZE_MIN} and {STOCK_SIZE_MAX}mm"),
+    )
+    ROUGHING_RULES: Tuple[_Rule, ...] = (
+        ("tool_number", 0, _INF, "Roughing tool number must be positive"),
+        ("tool_diameter", TOOL_DIAMETER_MIN, TOOL_DIAMETER_MAX,
+         f"Roughing tool diameter must be between {TOOL_DIAMETER_MIN} and {TOOL_DIAMETER_MAX}mm"),
+        ("depth_of_cut", DEPTH_CUT_MIN, DEPTH_CUT_MAX,
+         f"Roughing depth of cut must be between {DEPTH_CUT_MIN} and {DEPTH_CUT_MAX}mm"),
+        ("leave_for_finishing", 0, _INF, "Roughing leave for finishing cannot be negative"),
+        ("width_of_cut", -_INF, "tool_diameter",
+         "Roughing width of cut must be at most tool diameter ({tool_diameter}mm)"),
+        ("rpm", RPM_MIN, RPM_MAX, f"Roughing RPM must be between {RPM_MIN} and {RPM_MAX}"),
+        ("feedrate", FEEDRATE_MIN, FEEDRATE_MAX,
+         f"Roughing feedrate must be between {FEEDRATE_MIN} and {FEEDRATE_MAX}mm/min"),
+    )
+    FINISHING_RULES: Tuple[_Rule, ...] = (
+        ("tool_number", 0, _INF, "Finishing tool number must be positive"),
+        ("tool_diameter", TOOL_DIAMETER_MIN, TOOL_DIAMETER_MAX,
+         f"Finishing tool diameter must be between {TOOL_DIAMETER_MIN} and {TOOL_DIAMETER_MAX}mm"),
+        ("width_of_cut", -_INF, "tool_diameter",
+         "Finishing width of cut must be at most tool diameter ({tool_diameter}mm)"),
+        ("rpm", RPM_MIN, RPM_MAX, f"Finishing RPM must be between {RPM_MIN} and {RPM_MAX}"),
+        ("feedrate", FEEDRATE_MIN, FEEDRATE_MAX,
+         f"Finishing feedrate must be between {FEEDRATE_MIN} and {FEEDRATE_MAX}mm/min"),
+    )
+    
+    # Required fields per section, fetched in one call
+    STOCK_FIELDS = itemgetter("x_size", "y_size", "z_size", "finished_z_height", "stock_offset")
+    ROUGHING_FIELDS = itemgetter(*(rule[0] for rule in ROUGHING_RULES))
+    FINISHING_FIELDS = itemgetter(*(rule[0] for rule in FINISHING_RULES))
+    
     @staticmethod
     def validate(parameters: Dict[str, Any]) -> Tuple[bool, str]:
         """
@@ -99,6 +143,27 @@ class InputValidator:
         
         return True, ""
     
+    @staticmethod
+    def _get_fields(section: Dict[str, Any], fields: Callable[[Dict[str, Any]], tuple]) -> Union[tuple, None]:
+        """Return the required field values of a section, or None if any is missing."""
+        try:
+            values = fields(section)
+        except KeyError:
+            return None
+        if any(v is None for v in values):
+            return None
+        return values
+    
+    @staticmethod
+    def _check_rules(section: Dict[str, Any], rules: Tuple[_Rule, ...]) -> Tuple[bool, str]:
+        """Check a section against range rules, returning the first failure."""
+        for key, low, high, message in rules:
+            if isinstance(high, str):
+                high = section[high]
+            if not (low <= section[key] <= high):
+                return False, message.format_map(section)
+        return True, ""
+    
     @staticmethod
     def _validate_position(position: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate position parameters."""
@@ -117,25 +182,16 @@ class InputValidator:
     @staticmethod
     def _validate_stock(stock: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate stock parameters."""
-        x_size = stock.get("x_size")
-        y_size = stock.get("y_size")
-        z_size = stock.get("z_size")
-        finished_z = stock.get("finished_z_height")
-        offset = stock.get("stock_offset")
-        
         # Check all required fields exist
-        if any(v is None for v in [x_size, y_size, z_size, finished_z, offset]):
+        values = InputValidator._get_fields(stock, InputValidator.STOCK_FIELDS)
+        if values is None:
             return False, "Stock section missing required fields"
+        x_size, y_size, z_size, finished_z, offset = values
         
         # Check ranges
-        if not (InputValidator.STOCK_SIZE_MIN <= x_size <= InputValidator.STOCK_SIZE_MAX):
-            return False, f"Stock X size must be between {InputValidator.STOCK_SIZE_MIN} and {InputValidator.STOCK_SIZE_MAX}mm"
-        
-        if not (InputValidator.STOCK_SIZE_MIN <= y_size <= InputValidator.STOCK_SIZE_MAX):
-            return False, f"Stock Y size must be between {InputValidator.STOCK_SIZE_MIN} and {InputValidator.STOCK_SIZE_MAX}mm"
-        
-        if not (InputValidator.STOCK_SIZE_MIN <= z_size <= InputValidator.STOCK_SIZE_MAX):
-            return False, f"Stock Z size must be between {InputValidator.STOCK_SIZE_MIN} and {InputValidator.STOCK_SIZE_MAX}mm"
+        is_valid, msg = InputValidator._check_rules(stock, InputValidator.STOCK_RULES)
+        if not is_valid:
+            return is_valid, msg
         
         if not (0 <= finished_z < z_size):
             return False, "Finished Z height must be between 0 and Z size"
@@ -151,70 +207,20 @@ class InputValidator:
     @staticmethod
     def _validate_roughing(roughing: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate roughing parameters."""
-        tool_num = roughing.get("tool_number")
-        tool_dia = roughing.get("tool_diameter")
-        depth = roughing.get("depth_of_cut")
-        leave = roughing.get("leave_for_finishing")
-        width = roughing.get("width_of_cut")
-        rpm = roughing.get("rpm")
-        feedrate = roughing.get("feedrate")
-        
         # Check all required fields exist
-        if any(v is None for v in [tool_num, tool_dia, depth, leave, width, rpm, feedrate]):
+        if InputValidator._get_fields(roughing, InputValidator.ROUGHING_FIELDS) is None:
             return False, "Roughing section missing required fields"
         
-        if tool_num < 0:
-            return False, "Roughing tool number must be positive"
-        
-        if not (InputValidator.TOOL_DIAMETER_MIN <= tool_dia <= InputValidator.TOOL_DIAMETER_MAX):
-            return False, f"Roughing tool diameter must be between {InputValidator.TOOL_DIAMETER_MIN} and {InputValidator.TOOL_DIAMETER_MAX}mm"
-        
-        if not (InputValidator.DEPTH_CUT_MIN <= depth <= InputValidator.DEPTH_CUT_MAX):
-            return False, f"Roughing depth of cut must be between {InputValidator.DEPTH_CUT_MIN} and {InputValidator.DEPTH_CUT_MAX}mm"
-        
-        if leave < 0:
-            return False, "Roughing leave for finishing cannot be negative"
-        
-        if width > tool_dia:
-            return False, f"Roughing width of cut must be at most tool diameter ({tool_dia}mm)"
-        
-        if not (InputValidator.RPM_MIN <= rpm <= InputValidator.RPM_MAX):
-            return False, f"Roughing RPM must be between {InputValidator.RPM_MIN} and {InputValidator.RPM_MAX}"
-        
-        if not (InputValidator.FEEDRATE_MIN <= feedrate <= InputValidator.FEEDRATE_MAX):
-            return False, f"Roughing feedrate must be between {InputValidator.FEEDRATE_MIN} and {InputValidator.FEEDRATE_MAX}mm/min"
-        
-        return True, ""
+        return InputValidator._check_rules(roughing, InputValidator.ROUGHING_RULES)
     
     @staticmethod
     def _validate_finishing(finishing: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate finishing parameters."""
-        tool_num = finishing.get("tool_number")
-        tool_dia = finishing.get("tool_diameter")
-        width = finishing.get("width_of_cut")
-        rpm = finishing.get("rpm")
-        feedrate = finishing.get("feedrate")
-        
         # Check all required fields exist
-        if any(v is None for v in [tool_num, tool_dia, width, rpm, feedrate]):
+        if InputValidator._get_fields(finishing, InputValidator.FINISHING_FIELDS) is None:
             return False, "Finishing section missing required fields"
         
-        if tool_num < 0:
-            return False, "Finishing tool number must be positive"
-        
-        if not (InputValidator.TOOL_DIAMETER_MIN <= tool_dia <= InputValidator.TOOL_DIAMETER_MAX):
-            return False, f"Finishing tool diameter must be between {InputValidator.TOOL_DIAMETER_MIN} and {InputValidator.TOOL_DIAMETER_MAX}mm"
-        
-        if width > tool_dia:
-            return False, f"Finishing width of cut must be at most tool diameter ({tool_dia}mm)"
-        
-        if not (InputValidator.RPM_MIN <= rpm <= InputValidator.RPM_MAX):
-            return False, f"Finishing RPM must be between {InputValidator.RPM_MIN} and {InputValidator.RPM_MAX}"
-        
-        if not (InputValidator.FEEDRATE_MIN <= feedrate <= InputValidator.FEEDRATE_MAX):
-            return False, f"Finishing feedrate must be between {InputValidator.FEEDRATE_MIN} and {InputValidator.FEEDRATE_MAX}mm/min"
-        
-        return True, ""
+        return InputValidator._check_rules(finishing, InputValidator.FINISHING_RULES)
     
     @staticmethod
     def _validate_machine_settings(settings: Dict[str, Any]) -> Tuple[bool, str]:
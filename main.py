@@ -18,8 +18,8 @@ else:
 
 sys.path.insert(0, str(project_root))
 
-from ui.main_window import run_application
-
 
 if __name__ == "__main__":
+    # Imported here so importing this module does not load Tk
+    from ui.main_window import run_application
     run_application()
@@ -6,15 +6,37 @@ Handles displaying images for input fields.
 import tkinter as tk
 from tkinter import ttk
 from pathlib import Path
-from typing import Optional
+from typing import Dict, FrozenSet, Optional, Tuple, Union
+import math
 import os
 import sys
+import threading
 
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+# PIL is imported on first use by _import_pil(); it is only needed when an
+# illustration has no pre-rendered thumbnail. None until the import is tried.
+PIL_AVAILABLE: Optional[bool] = None
+Image = None
+ImageTk = None
+
+
+def _import_pil() -> bool:
+    """
+    Import PIL on first call.
+    
+    Returns:
+        True if PIL is available
+    """
+    global PIL_AVAILABLE, Image, ImageTk
+    if PIL_AVAILABLE is None:
+        try:
+            from PIL import Image, ImageTk
+            PIL_AVAILABLE = True
+        except ImportError:
+            PIL_AVAILABLE = False
+    return PIL_AVAILABLE
+
+# Largest size an illustration is shown at; build.py pre-renders thumbnails to fit it
+THUMBNAIL_SIZE: Tuple[int, int] = (300, 200)
 
 
 def get_images_dir() -> Path:
@@ -36,6 +58,79 @@ def get_images_dir() -> Path:
         return Path(__file__).parent.parent / "assets" / "images"
 
 
+def get_thumbnails_dir(images_dir: Path) -> Path:
+    """
+    Get the directory with thumbnails pre-rendered by build.py.
+    
+    Args:
+        images_dir: Directory containing the full-size illustration images
+        
+    Returns:
+        Path to the thumbnails directory (may not exist in a source checkout)
+    """
+    return images_dir / "thumbs"
+
+
+# Resolved once; the location does not change while the application runs
+_IMAGES_DIR = get_images_dir()
+
+
+def _resize_image(image_path: Path, size: Tuple[int, int] = THUMBNAIL_SIZE) -> "Image.Image":
+    """Load an image with PIL and resize it to fit size (PIL must be imported)."""
+    img = Image.open(image_path)
+    img.thumbnail(size, Image.Resampling.LANCZOS)
+    return img
+
+
+def _load_native_photo(master: tk.Misc, image_path: Path,
+                       size: Tuple[int, int]) -> Optional[tk.PhotoImage]:
+    """Load an image with Tk's built-in PNG/GIF reader and decimate it to fit size."""
+    try:
+        photo = tk.PhotoImage(master=master, file=str(image_path))
+    except tk.TclError:
+        return None
+    factor = max(math.ceil(photo.width() / size[0]), math.ceil(photo.height() / size[1]))
+    if factor > 1:
+        photo = photo.subsample(factor)
+    return photo
+
+
+def load_photo(master: tk.Misc, image_path: Optional[Path], size: Tuple[int, int] = THUMBNAIL_SIZE,
+               thumb_path: Optional[Path] = None) -> Union[tk.PhotoImage, "ImageTk.PhotoImage", None]:
+    """
+    Load an illustration resized to fit size.
+    
+    A thumbnail pre-rendered by build.py is used as is when size is
+    THUMBNAIL_SIZE. Otherwise the image is resized with PIL, or decimated
+    by Tk (lower quality than LANCZOS) when PIL is not installed.
+    
+    Args:
+        master: Widget owning the PhotoImage
+        image_path: Path to the full-size image (None if there is none)
+        size: Maximum (width, height) of the image
+        thumb_path: Path to the pre-rendered thumbnail, if there is one
+        
+    Returns:
+        PhotoImage, or None if there is no usable file or Tk cannot read it
+    """
+    if thumb_path is not None and size == THUMBNAIL_SIZE:
+        # Already at display size: no PIL and no resampling needed
+        return tk.PhotoImage(master=master, file=str(thumb_path))
+    if image_path is None:
+        return None
+    if _import_pil():
+        return ImageTk.PhotoImage(_resize_image(image_path, size), master=master)
+    return _load_native_photo(master, image_path, size)
+
+
+def _field_title(field_name: str) -> str:
+    """Derive a display title from a field label (no trailing colon or units)."""
+    title = field_name.rstrip(":")
+    if "(" in title:
+        title = title.split("(")[0].strip()
+    return title
+
+
 class IllustrationWindow:
     """Displays an illustration in a separate window."""
     
@@ -48,10 +143,24 @@ class IllustrationWindow:
             images_dir: Directory containing illustration images (optional)
         """
         self.parent = parent
-        self.images_dir = Path(images_dir) if images_dir else get_images_dir()
+        self.images_dir = Path(images_dir) if images_dir else _IMAGES_DIR
+        self.thumbs_dir = get_thumbnails_dir(self.images_dir)
         self.window: Optional[tk.Toplevel] = None
-        self.current_image: Optional[ImageTk.PhotoImage] = None
+        self.current_image: Union[tk.PhotoImage, "ImageTk.PhotoImage", None] = None
         self.image_label: Optional[tk.Label] = None
+        # Resized images by file name; also keeps the PhotoImages referenced for Tk
+        self._photo_cache: Dict[str, Union[tk.PhotoImage, "ImageTk.PhotoImage"]] = {}
+        # File names in images_dir and thumbs_dir, listed once on first use
+        # (the assets do not change while the application runs)
+        self._image_files: Optional[FrozenSet[str]] = None
+        self._thumb_files: Optional[FrozenSet[str]] = None
+        # Resized PIL images for illustrations without a thumbnail, filled by
+        # _warm_cache() in the background; PhotoImages must be made on the Tk thread
+        self._resized_images: Dict[str, "Image.Image"] = {}
+        # (image_name, title) currently on display, to skip redundant updates
+        self._last_shown: Optional[Tuple[str, str]] = None
+        # The cache warm-up (and PIL import) starts when the first illustration is shown
+        self._warm_started = False
     
     def show_illustration(self, image_name: str, title: str = "Illustration") -> None:
         """
@@ -61,27 +170,43 @@ class IllustrationWindow:
             image_name: Name of the image file (e.g., "X-pos.png")
             title: Title for the window
         """
-        if not PIL_AVAILABLE:
+        # Same illustration as last time: just bring the window to the front
+        if (image_name, title) == self._last_shown and self.window is not None \
+                and self.window.winfo_exists() and self.window.state() != "withdrawn":
+            self.window.lift()
             return
         
-        image_path = self.images_dir / image_name
+        if not self._warm_started:
+            self._warm_started = True
+            threading.Thread(target=self._warm_cache, daemon=True).start()
         
-        if not image_path.exists():
-            return
+        # Paths and file lists are only needed the first time an image is shown
+        photo = self._photo_cache.get(image_name)
+        if photo is None:
+            self._list_image_dirs()
+            if image_name not in self._thumb_files and image_name not in self._image_files:
+                return
         
-        # Create or bring to front the illustration window
+        # Create the illustration window once; afterwards just show it again
         if self.window is None or not self.window.winfo_exists():
             self._create_window()
+        else:
+            self.window.deiconify()
         
         # Load and display the image
         try:
-            img = Image.open(image_path)
-            
-            # Resize image to fit window (max 300x200)
-            img.thumbnail((300, 200), Image.Resampling.LANCZOS)
-            
-            # Convert to PhotoImage
-            self.current_image = ImageTk.PhotoImage(img)
+            if photo is None:
+                # Resized in the background by _warm_cache(), if it got there first
+                img = self._resized_images.pop(image_name, None)
+                if img is not None:
+                    photo = ImageTk.PhotoImage(img, master=self.window)
+                else:
+                    thumb_path = self.thumbs_dir / image_name if image_name in self._thumb_files else None
+                    photo = load_photo(self.window, self.images_dir / image_name, thumb_path=thumb_path)
+                    if photo is None:
+                        return
+                self._photo_cache[image_name] = photo
+            self.current_image = photo
             
             # Update label with new image
             if self.image_label:
@@ -90,26 +215,55 @@ class IllustrationWindow:
             # Update window title
             self.window.title(f"Illustration - {title}")
             self.window.lift()
+            self._last_shown = (image_name, title)
             
         except Exception as e:
             pass
     
+    def _list_image_dirs(self) -> None:
+        """List the images and thumbnails directories if not done yet."""
+        if self._image_files is None:
+            self._thumb_files = self._list_files(self.thumbs_dir)
+            self._image_files = self._list_files(self.images_dir)
+    
+    def _warm_cache(self) -> None:
+        """Resize the illustrations that have no thumbnail (runs in a background thread)."""
+        self._list_image_dirs()
+        names = [name for name in sorted(self._image_files - self._thumb_files)
+                 if name.lower().endswith(".png")]
+        if not names or not _import_pil():
+            return
+        for name in names:
+            try:
+                self._resized_images[name] = _resize_image(self.images_dir / name)
+            except Exception:
+                pass
+    
+    @staticmethod
+    def _list_files(directory: Path) -> FrozenSet[str]:
+        """Return the file names in a directory, or an empty set if it does not exist."""
+        try:
+            return frozenset(os.listdir(directory))
+        except OSError:
+            return frozenset()
+    
     def _create_window(self) -> None:
         """Create the illustration display window."""
         self.window = tk.Toplevel(self.parent)
         self.window.title("Illustration")
         self.window.geometry("320x240")
         self.window.resizable(False, False)
+        # Hide instead of destroying so the window can be reused
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         # Create label for image
         self.image_label = tk.Label(self.window, bg="white", padx=10, pady=10)
         self.image_label.pack(fill=tk.BOTH, expand=True)
     
     def close(self) -> None:
-        """Close the illustration window."""
+        """Hide the illustration window; show_illustration() shows it again."""
         if self.window and self.window.winfo_exists():
-            self.window.destroy()
-            self.window = None
+            self.window.withdraw()
 
 
 class ImageMapper:
@@ -135,6 +289,12 @@ class ImageMapper:
         "Coolant": "Table.png",  # Generic image for coolant selection
     }
     
+    # (image filename, display title) per mapped field, derived once
+    _FIELD_META = {
+        field_name: (image_name, _field_title(field_name))
+        for field_name, image_name in FIELD_IMAGE_MAP.items()
+    }
+    
     @classmethod
     def get_image_for_field(cls, field_name: str) -> Optional[str]:
         """
@@ -148,6 +308,19 @@ class ImageMapper:
         """
         return cls.FIELD_IMAGE_MAP.get(field_name)
     
+    @classmethod
+    def get_meta(cls, field_name: str) -> Optional[Tuple[str, str]]:
+        """
+        Get the image filename and display title for a field in one lookup.
+        
+        Args:
+            field_name: The field label text
+            
+        Returns:
+            (image filename, display title) or None if the field is not mapped
+        """
+        return cls._FIELD_META.get(field_name)
+    
     @classmethod
     def get_title_for_field(cls, field_name: str) -> str:
         """
@@ -160,7 +333,7 @@ class ImageMapper:
             Display title
         """
         # Remove trailing colon and (units) if present
-        title = field_name.rstrip(":")
-        if "(" in title:
-            title = title.split("(")[0].strip()
-        return title
+        meta = cls._FIELD_META.get(field_name)
+        if meta is None:
+            return _field_title(field_name)
+        return meta[1]
@@ -3,53 +3,155 @@ Main UI window for FaceMilling application.
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional, Tuple, Union
 from pathlib import Path
+import os
 import sys
+import threading
 
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    ImageTk = None
-
-from ui.widgets import NumericInputFrame
-from ui.illustrations import IllustrationWindow, ImageMapper
+from ui.widgets import NumericInputFrame, get_small_font
+from ui.illustrations import IllustrationWindow, ImageMapper, THUMBNAIL_SIZE, get_thumbnails_dir, load_photo
 from ui import statusbar
 from config import get_config_manager
 from gcode.generator import GCodeGenerator
 
 from version import __version__
 
+if TYPE_CHECKING:
+    from PIL import ImageTk
 
-def get_asset_path(filename: str) -> Path:
-    """
-    Get the full path to an asset file, supporting both dev and exe environments.
-    """
-    # Determine assets root depending on dev or frozen (exe) mode
+# Maximum number of resized illustrations kept in memory
+_PHOTO_CACHE_SIZE = 20
+# Delay after the last key in Leave for Finishing before finishing inputs are updated
+_LEAVE_DEBOUNCE_MS = 200
+# Timestamp appended to the program name when append_timestamp is set
+_TS_FMT = "%Y%m%d_%H%M%S"
+# How often the UI checks whether a background POST has finished
+_POST_POLL_MS = 50
+
+
+def _to(conv: type, s: str, default: Any) -> Any:
+    """Convert an entry's text with conv, returning default if it is not a valid number."""
+    try:
+        return conv(s)
+    except (ValueError, TypeError):
+        return default
+
+
+def _get_assets_root() -> Path:
+    """Get the assets directory, supporting both dev and exe environments."""
     if getattr(sys, 'frozen', False):
         meipass = getattr(sys, '_MEIPASS', None)
         if meipass:
-            assets_root = Path(meipass) / "assets"
-        else:
-            assets_root = Path(sys.executable).parent / "assets"
-    else:
-        assets_root = Path(__file__).parent.parent / "assets"
+            return Path(meipass) / "assets"
+        return Path(sys.executable).parent / "assets"
+    return Path(__file__).parent.parent / "assets"
+
+
+def _index_assets(assets_root: Path) -> Dict[str, Path]:
+    """Map the file names in assets_root and assets_root/images to their paths."""
+    index: Dict[str, Path] = {}
+    # Scan the root last so its files (e.g. icons) win over assets/images
+    for directory in (assets_root / "images", assets_root):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        index[entry.name] = Path(entry.path)
+        except OSError:
+            pass
+    return index
+
+
+def _index_thumbnails(images_dir: Path) -> Dict[str, Path]:
+    """Map the thumbnail file names pre-rendered by build.py to their paths."""
+    thumbs_dir = get_thumbnails_dir(images_dir)
+    try:
+        return {name: thumbs_dir / name for name in os.listdir(thumbs_dir)}
+    except OSError:
+        # Source checkout without a build: no thumbnails
+        return {}
+
 
+# Assets are read-only at runtime, so locate them once instead of stat-ing per lookup
+_ASSETS_ROOT = _get_assets_root()
+_ASSET_INDEX = _index_assets(_ASSETS_ROOT)
+_THUMB_INDEX = _index_thumbnails(_ASSETS_ROOT / "images")
+
+
+def get_asset_path(filename: str) -> Path:
+    """
+    Get the full path to an asset file, supporting both dev and exe environments.
+    """
     # Prefer a file in the assets root (useful for icon files), otherwise fall back to assets/images
-    candidate_root = assets_root / filename
-    if candidate_root.exists():
-        return candidate_root
+    return _ASSET_INDEX.get(filename, _ASSETS_ROOT / "images" / filename)
 
-    images_dir = assets_root / "images"
-    return images_dir / filename
+
+def find_asset_path(filename: str) -> Optional[Path]:
+    """
+    Get the full path to an asset file, or None if it does not exist.
+    """
+    return _ASSET_INDEX.get(filename)
 
 
 class MainWindow:
     """Main application window."""
 
+    # Input rows per section: (attribute name, label text, input type, default value)
+    POSITION_FIELDS = (
+        ("position_x", "X Position:", "float", "0.0"),
+        ("position_y", "Y Position:", "float", "0.0"),
+    )
+    STOCK_FIELDS = (
+        ("stock_x", "X Size:", "float", "100.0"),
+        ("stock_y", "Y Size:", "float", "100.0"),
+        ("stock_z", "Z Size:", "float", "50.0"),
+        ("stock_finished_z", "Finished Z Height:", "float", "10.0"),
+        ("stock_offset", "Stock Offset:", "int", "0"),
+    )
+    ROUGHING_FIELDS = (
+        ("roughing_tool", "Tool Number:", "int", "1"),
+        ("roughing_diameter", "Tool Diameter:", "float", "10.0"),
+        ("roughing_depth", "Depth of Cut:", "float", "5.0"),
+        ("roughing_leave", "Leave for Finishing:", "float", "1.0"),
+        ("roughing_width", "Width of Cut:", "float", "20.0"),
+        ("roughing_rpm", "RPM:", "int", "5000"),
+        ("roughing_feedrate", "Feedrate:", "int", "1000"),
+    )
+    FINISHING_FIELDS = (
+        ("finishing_tool", "Tool Number:", "int", "2"),
+        ("finishing_diameter", "Tool Diameter:", "float", "10.0"),
+        ("finishing_width", "Width of Cut:", "float", "20.0"),
+        ("finishing_rpm", "RPM:", "int", "8000"),
+        ("finishing_feedrate", "Feedrate:", "int", "1500"),
+    )
+    # Config default per entry: (attribute name, defaults section, key, fallback value)
+    DEFAULT_VALUES = (
+        ("position_x", "position", "x", 0.0),
+        ("position_y", "position", "y", 0.0),
+        ("stock_x", "stock", "x_size", 100.0),
+        ("stock_y", "stock", "y_size", 100.0),
+        ("stock_z", "stock", "z_size", 50.0),
+        ("stock_finished_z", "stock", "finished_z_height", 10.0),
+        ("stock_offset", "stock", "stock_offset", 0),
+        ("roughing_tool", "roughing", "tool_number", 1),
+        ("roughing_diameter", "roughing", "tool_diameter", 10.0),
+        ("roughing_depth", "roughing", "depth_of_cut", 5.0),
+        ("roughing_leave", "roughing", "leave_for_finishing", 1.0),
+        ("roughing_width", "roughing", "width_of_cut", 20.0),
+        ("roughing_rpm", "roughing", "rpm", 5000),
+        ("roughing_feedrate", "roughing", "feedrate", 1000),
+        ("finishing_tool", "finishing", "tool_number", 2),
+        ("finishing_diameter", "finishing", "tool_diameter", 10.0),
+        ("finishing_width", "finishing", "width_of_cut", 20.0),
+        ("finishing_rpm", "finishing", "rpm", 8000),
+        ("finishing_feedrate", "finishing", "feedrate", 1500),
+    )
+
     def __init__(self, root: tk.Tk):
         """
         Initialize the main window.
@@ -58,12 +160,16 @@ class MainWindow:
         self.root.title("FaceMilling - CNC Program Generator")
         self.root.geometry("1000x900")
 
+        # Shared fonts and ttk styles; set up before any widget is created
+        self._create_fonts()
+        self._create_styles()
+
         # Set window icon (optional)
         try:
             # Try multiple common icon filenames
             for ico_name in ("Facemiller.ico", "icon.ico", "facemiller.ico"):
-                icon_path = get_asset_path(ico_name)
-                if icon_path.exists():
+                icon_path = find_asset_path(ico_name)
+                if icon_path is not None:
                     self.root.iconbitmap(str(icon_path))
                     break
         except Exception:
@@ -71,10 +177,25 @@ class MainWindow:
 
         # Load configuration
         self.config_manager = get_config_manager()
-        config = self.config_manager.get_all()
+        # Config sections cached on the instance; _refresh_config_cache() re-reads them
+        self._coolant_options: Dict[str, Dict[str, int]] = {}
+        self._machine_settings: Optional[Dict[str, Any]] = None
+        self._refresh_config_cache()
+
+        # One generator for every POST; it keeps no state between programs
+        self._generator = GCodeGenerator()
+        # Background POST in progress (None when idle) and its save_program() result
+        self._post_thread: Optional[threading.Thread] = None
+        self._post_saved = False
+        # Exception raised by the background POST, reported by _poll_post()
+        self._post_error: Optional[Exception] = None
 
         # Current illustration display
         self.current_illustration = None
+        # Field label per entry widget name, for the shared <FocusIn> handler
+        self._focus_labels: Dict[str, str] = {}
+        # Resized illustrations by (image name, size), least recently used first
+        self._photo_cache: "OrderedDict[Tuple[str, Tuple[int, int]], Union[tk.PhotoImage, ImageTk.PhotoImage]]" = OrderedDict()
 
         # Create UI
         self.create_ui()
@@ -88,6 +209,25 @@ class MainWindow:
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def _create_fonts(self) -> None:
+        """
+        Create the named fonts shared by all widgets.
+
+        Entries and section frames get their font from the option database,
+        so they need no font option of their own.
+        """
+        self._font_small = get_small_font(self.root)
+        self._font_hint = tkfont.Font(self.root, name="FaceMillingHint", family="Arial", size=10)
+        self._font_title = tkfont.Font(self.root, name="FaceMillingTitle", family="Arial", size=11, weight="bold")
+        self._font_button = tkfont.Font(self.root, name="FaceMillingButton", family="Arial", size=12, weight="bold")
+        self.root.option_add("*TEntry.font", self._font_small)
+        self.root.option_add("*Labelframe.font", self._font_title)
+
+    def _create_styles(self) -> None:
+        """Configure the ttk styles used by the form widgets."""
+        style = ttk.Style(self.root)
+        style.configure("Form.TLabel", font=self._font_small, anchor="w")
+
     def on_closing(self) -> None:
         """Handle application closing."""
         self.root.destroy()
@@ -99,25 +239,48 @@ class MainWindow:
         right_frame.config(width=320, height=240)
         right_frame.pack_propagate(False)
 
-        # Create label for image
-        self.image_label = tk.Label(
-            right_frame,
-            bg="white",
-            fg="gray",
+        # Canvas with one image item and one message item, updated in place
+        self.image_canvas = tk.Canvas(right_frame, bg="white", highlightthickness=0)
+        self.image_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self._canvas_image_id = self.image_canvas.create_image(150, 100, anchor=tk.CENTER, state=tk.HIDDEN)
+        self._canvas_text_id = self.image_canvas.create_text(
+            150, 100,
+            anchor=tk.CENTER,
+            justify=tk.CENTER,
+            fill="gray",
             text="Select a field to view illustration",
-            font=("Arial", 10),
-            wraplength=300
+            font=self._font_hint,
+            width=300
         )
-        self.image_label.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.image_canvas.bind("<Configure>", self._on_canvas_resize)
 
         # Store reference for PhotoImage
-        self.current_photo_image: Optional[ImageTk.PhotoImage] = None
+        self.current_photo_image: Union[tk.PhotoImage, "ImageTk.PhotoImage", None] = None
+
+    def _on_canvas_resize(self, event: tk.Event) -> None:
+        """Keep the illustration and message centred in the canvas."""
+        for item in (self._canvas_image_id, self._canvas_text_id):
+            self.image_canvas.coords(item, event.width / 2, event.height / 2)
+
+    def _show_photo(self, photo: Union[tk.PhotoImage, "ImageTk.PhotoImage"]) -> None:
+        """Show an image in the illustration panel, hiding any message."""
+        if photo is self.current_photo_image:
+            return
+        self.current_photo_image = photo
+        self.image_canvas.itemconfig(self._canvas_image_id, image=photo, state=tk.NORMAL)
+        self.image_canvas.itemconfig(self._canvas_text_id, state=tk.HIDDEN)
+
+    def _show_message(self, text: str, color: str) -> None:
+        """Show a message in the illustration panel instead of an image."""
+        self.current_photo_image = None
+        self.image_canvas.itemconfig(self._canvas_image_id, state=tk.HIDDEN)
+        self.image_canvas.itemconfig(self._canvas_text_id, text=text, fill=color, state=tk.NORMAL)
 
     def create_ui(self) -> None:
         """Create the main UI layout."""
-        # Main container with two columns: form (left) and image (right)
+        # Main container with two columns: form (left) and image (right).
+        # It is packed last, so its children are laid out once instead of per widget.
         main_frame = ttk.Frame(self.root)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
         # Left side: non-scrollable form
         left_frame = ttk.Frame(main_frame)
@@ -132,6 +295,25 @@ class MainWindow:
         self.create_roughing_section(form_frame)
         self.create_finishing_section(form_frame)
 
+        # Inputs enabled/disabled together, with their current state (None = not set yet)
+        self._rough_widgets = tuple(getattr(self, field[0]) for field in self.ROUGHING_FIELDS)
+        self._finish_widgets = tuple(getattr(self, field[0]) for field in self.FINISHING_FIELDS)
+        self._rough_enabled: Optional[bool] = None
+        self._finish_enabled: Optional[bool] = None
+
+        # Numeric parameters read by collect_parameters(): (section, key, entry, converter, default).
+        # The converter follows the field's input type; blank or invalid input reads as zero.
+        input_types = {
+            field[0]: field[2]
+            for fields in (self.POSITION_FIELDS, self.STOCK_FIELDS, self.ROUGHING_FIELDS, self.FINISHING_FIELDS)
+            for field in fields
+        }
+        converters = {"float": float, "int": int}
+        self._param_schema = tuple(
+            (section, key, getattr(self, attr), converters[input_types[attr]], converters[input_types[attr]]())
+            for attr, section, key, _ in self.DEFAULT_VALUES
+        )
+
         # Create button frame at bottom of form
         button_frame = ttk.Frame(form_frame)
         button_frame.pack(fill=tk.X, pady=10)
@@ -140,17 +322,17 @@ class MainWindow:
         self.create_illustration_panel(main_frame)
 
         # POST PROGRAM button
-        post_button = tk.Button(
+        self.post_button = tk.Button(
             button_frame,
             text="POST PROGRAM",
             command=self.post_program,
             bg="#4CAF50",
             fg="white",
-            font=("Arial", 12, "bold"),
+            font=self._font_button,
             padx=20,
             pady=10
         )
-        post_button.pack(side=tk.LEFT, padx=5)
+        self.post_button.pack(side=tk.LEFT, padx=5)
 
         # Reset button
         reset_button = tk.Button(
@@ -159,7 +341,7 @@ class MainWindow:
             command=self.reset_form,
             bg="#2196F3",
             fg="white",
-            font=("Arial", 12, "bold"),
+            font=self._font_button,
             padx=20,
             pady=10
         )
@@ -180,165 +362,138 @@ class MainWindow:
 
         # Register status label for global access via ui.statusbar
         try:
-            statusbar.register(self.status_label)
+            statusbar.register(self.status_label, self.status_var)
         except Exception:
             pass
 
+        # Map the fully built form; packed after the status bar, which keeps its row when the window shrinks
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
     def _create_aligned_input(self, parent: tk.Widget, row: int, label_text: str, 
-                              input_type: str = "float", default_value: str = "0.0") -> tk.Entry:
+                              input_type: str = "float", default_value: str = "0.0") -> ttk.Entry:
         """
         Create a properly aligned label and entry field using grid.
         """
-        label = tk.Label(parent, text=label_text, font=("Arial", 9), width=20, anchor="w")
+        label = ttk.Label(parent, text=label_text, style="Form.TLabel", width=20)
         label.grid(row=row, column=0, sticky=tk.W, padx=(0, 8), pady=2)
-        entry = tk.Entry(parent, font=("Arial", 9), width=15)
+        entry = ttk.Entry(parent, width=15)
         entry.grid(row=row, column=1, sticky=tk.EW, pady=2)
         if default_value:
             entry.insert(0, default_value)
-        entry.bind("<FocusIn>", lambda e: self.display_illustration(label_text))
+        # One shared focus handler; it finds the label through _focus_labels
+        self._focus_labels[str(entry)] = label_text
+        entry.bind("<FocusIn>", self._on_entry_focus)
         return entry
 
+    def _create_inputs(self, parent: tk.Widget, fields: Tuple[Tuple[str, str, str, str], ...],
+                       first_row: int = 0) -> int:
+        """
+        Create an aligned input row for each field spec and store the entries as attributes.
+
+        Args:
+            parent: Section frame to place the rows in
+            fields: (attribute name, label text, input type, default value) per row
+            first_row: Grid row of the first input
+
+        Returns:
+            The next free grid row
+        """
+        row = first_row
+        for attr_name, label_text, input_type, default_value in fields:
+            setattr(self, attr_name, self._create_aligned_input(parent, row, label_text, input_type, default_value))
+            row += 1
+        return row
+
+    def _create_section_frame(self, parent: tk.Widget, title: str) -> tk.LabelFrame:
+        """Create a titled section frame with a fixed label column and an expandable entry column."""
+        frame = tk.LabelFrame(parent, text=title, padx=8, pady=6)
+        frame.pack(fill=tk.X, pady=6)
+        frame.columnconfigure(0, weight=0)  # Label column - fixed width
+        frame.columnconfigure(1, weight=1)  # Entry column - expandable
+        return frame
+
     def _get_selected_coolants(self) -> dict:
-        coolant_options = self.config_manager.get_section("coolant_options")
-        selected_coolants = {}
-        for coolant_name, var in self.coolant_vars.items():
-            if var.get():
-                selected_coolants[coolant_name] = coolant_options[coolant_name]
-        return selected_coolants
+        # Re-read the checkboxes only if one has changed since the last call
+        if self._coolant_dirty:
+            # A checkbox whose coolant was removed from the reloaded config is ignored
+            self._selected_coolants = {
+                coolant_name: self._coolant_options[coolant_name]
+                for coolant_name, var in self.coolant_vars.items()
+                if var.get() and coolant_name in self._coolant_options
+            }
+            self._coolant_dirty = False
+        return dict(self._selected_coolants)
+
+    def _mark_coolant_dirty(self) -> None:
+        """Flag the coolant selection as changed."""
+        self._coolant_dirty = True
 
     def create_position_section(self, parent: tk.Widget) -> None:
-        frame = tk.LabelFrame(parent, text="Position", font=("Arial", 11, "bold"), padx=8, pady=6)
-        frame.pack(fill=tk.X, pady=6)
+        frame = self._create_section_frame(parent, "Position")
         self.position_frame = frame
-        frame.columnconfigure(0, weight=0)
-        frame.columnconfigure(1, weight=1)
         reference_frame = tk.Frame(frame)
         reference_frame.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=3)
-        tk.Label(reference_frame, text="Reference:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Label(reference_frame, text="Reference:", style="Form.TLabel").pack(side=tk.LEFT, padx=(0, 8))
         self.position_reference = tk.StringVar(value="Table")
         for ref in ["Table", "G55", "G56", "G57"]:
-            tk.Radiobutton(reference_frame, text=ref, variable=self.position_reference, value=ref, command=lambda r=ref: self._on_reference_change(r)).pack(side=tk.LEFT, padx=5)
-        self.position_x = self._create_aligned_input(frame, 1, "X Position:", "float", "0.0")
-        self.position_y = self._create_aligned_input(frame, 2, "Y Position:", "float", "0.0")
+            ttk.Radiobutton(reference_frame, text=ref, variable=self.position_reference, value=ref, command=self._on_reference_selected).pack(side=tk.LEFT, padx=5)
+        self._create_inputs(frame, self.POSITION_FIELDS, first_row=1)
 
     def create_stock_section(self, parent: tk.Widget) -> None:
-        frame = tk.LabelFrame(parent, text="Stock", font=("Arial", 11, "bold"), padx=8, pady=6)
-        frame.pack(fill=tk.X, pady=6)
-        self.stock_frame = frame
-        frame.columnconfigure(0, weight=0)
-        frame.columnconfigure(1, weight=1)
-        row = 0
-        self.stock_x = self._create_aligned_input(frame, row, "X Size:", "float", "100.0")
-        row += 1
-        self.stock_y = self._create_aligned_input(frame, row, "Y Size:", "float", "100.0")
-        row += 1
-        self.stock_z = self._create_aligned_input(frame, row, "Z Size:", "float", "50.0")
-        row += 1
-        self.stock_finished_z = self._create_aligned_input(frame, row, "Finished Z Height:", "float", "10.0")
-        row += 1
-        self.stock_offset = self._create_aligned_input(frame, row, "Stock Offset:", "int", "0")
+        self.stock_frame = self._create_section_frame(parent, "Stock")
+        self._create_inputs(self.stock_frame, self.STOCK_FIELDS)
     
     def create_roughing_section(self, parent: tk.Widget) -> None:
         """Create Roughing input section."""
-        frame = tk.LabelFrame(parent, text="Roughing", font=("Arial", 11, "bold"), padx=8, pady=6)
-        frame.pack(fill=tk.X, pady=6)
-        
-        self.roughing_frame = frame
-        
-        # Configure two-column grid: labels (fixed width) and entries (expandable)
-        frame.columnconfigure(0, weight=0)  # Label column - fixed width
-        frame.columnconfigure(1, weight=1)  # Entry column - expandable
-        
-        row = 0
-        
-        # Tool Number
-        self.roughing_tool = self._create_aligned_input(frame, row, "Tool Number:", "int", "1")
-        row += 1
-        
-        # Tool Diameter
-        self.roughing_diameter = self._create_aligned_input(frame, row, "Tool Diameter:", "float", "10.0")
-        row += 1
-        
-        # Depth of Cut
-        self.roughing_depth = self._create_aligned_input(frame, row, "Depth of Cut:", "float", "5.0")
-        row += 1
-        
-        # Leave for Finishing
-        self.roughing_leave = self._create_aligned_input(frame, row, "Leave for Finishing:", "float", "1.0")
-        self.roughing_leave.bind("<KeyRelease>", lambda e: self._on_leave_for_finishing_change())
-        row += 1
-        
-        # Width of Cut
-        self.roughing_width = self._create_aligned_input(frame, row, "Width of Cut:", "float", "20.0")
-        row += 1
-        
-        # RPM
-        self.roughing_rpm = self._create_aligned_input(frame, row, "RPM:", "int", "5000")
-        row += 1
-        
-        # Feedrate
-        self.roughing_feedrate = self._create_aligned_input(frame, row, "Feedrate:", "int", "1000")
+        self.roughing_frame = self._create_section_frame(parent, "Roughing")
+        self._create_inputs(self.roughing_frame, self.ROUGHING_FIELDS)
+        # Pending debounced Leave for Finishing check (after() id)
+        self._leave_after_id: Optional[str] = None
+        self.roughing_leave.bind("<KeyRelease>", self._debounce_leave)
 
         # Coolant options (common area) - small section below roughing
         self.create_coolant_section(parent)
     
     def create_coolant_section(self, parent: tk.Widget) -> None:
         """Create Coolant selection section with checkboxes."""
-        coolant_frame = tk.LabelFrame(parent, text="Coolant Options", font=("Arial", 11, "bold"), padx=8, pady=6)
+        coolant_frame = tk.LabelFrame(parent, text="Coolant Options", padx=8, pady=6)
         coolant_frame.pack(fill=tk.X, pady=6)
         
-        # Get coolant options from config
-        coolant_options = self.config_manager.get_section("coolant_options")
+        coolant_options = self._coolant_options
+        
+        # Selection cache for _get_selected_coolants(), rebuilt when dirty
+        self._selected_coolants = {}
+        self._coolant_dirty = True
         
         # Store coolant checkboxes as BooleanVars
         self.coolant_vars = {}
         for coolant_name in sorted(coolant_options.keys()):
             self.coolant_vars[coolant_name] = tk.BooleanVar(value=False)
-            tk.Checkbutton(
+            ttk.Checkbutton(
                 coolant_frame,
                 text=coolant_name,
-                variable=self.coolant_vars[coolant_name]
+                variable=self.coolant_vars[coolant_name],
+                command=self._mark_coolant_dirty
             ).pack(side=tk.LEFT, padx=10, pady=2)
     
     def create_finishing_section(self, parent: tk.Widget) -> None:
         """Create Finishing input section."""
-        frame = tk.LabelFrame(parent, text="Finishing", font=("Arial", 11, "bold"), padx=8, pady=6)
-        frame.pack(fill=tk.X, pady=6)
-        
+        frame = self._create_section_frame(parent, "Finishing")
         self.finishing_frame = frame
-        
-        # Configure two-column grid: labels (fixed width) and entries (expandable)
-        frame.columnconfigure(0, weight=0)  # Label column - fixed width
-        frame.columnconfigure(1, weight=1)  # Entry column - expandable
-        
-        row = 0
-        
-        # Tool Number
-        self.finishing_tool = self._create_aligned_input(frame, row, "Tool Number:", "int", "2")
-        row += 1
-        
-        # Tool Diameter
-        self.finishing_diameter = self._create_aligned_input(frame, row, "Tool Diameter:", "float", "10.0")
-        row += 1
-        
-        # Width of Cut
-        self.finishing_width = self._create_aligned_input(frame, row, "Width of Cut:", "float", "20.0")
-        row += 1
-        
-        # RPM
-        self.finishing_rpm = self._create_aligned_input(frame, row, "RPM:", "int", "8000")
-        row += 1
-        
-        # Feedrate
-        self.finishing_feedrate = self._create_aligned_input(frame, row, "Feedrate:", "int", "1500")
-        row += 1
+        row = self._create_inputs(frame, self.FINISHING_FIELDS)
 
         # Only finish cut checkbox - disable roughing when checked
         opts_frame = tk.Frame(frame)
         opts_frame.grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=4)
         self.only_finish_var = tk.BooleanVar(value=False)
-        tk.Checkbutton(opts_frame, text="Only finish cut", variable=self.only_finish_var, command=self._on_only_finish_toggle).pack(side=tk.LEFT)
+        ttk.Checkbutton(opts_frame, text="Only finish cut", variable=self.only_finish_var, command=self._on_only_finish_toggle).pack(side=tk.LEFT)
     
+    def _on_entry_focus(self, event: tk.Event) -> None:
+        """Show the illustration for the input field that received focus."""
+        field_name = self._focus_labels.get(str(event.widget))
+        if field_name:
+            self._on_field_focus(field_name)
+
     def _on_field_focus(self, field_name: str):
         """
         Callback for field focus events.
@@ -348,6 +503,10 @@ class MainWindow:
         """
         self.display_illustration(field_name)
     
+    def _on_reference_selected(self) -> None:
+        """Shared radiobutton command; the selected reference is read from its variable."""
+        self._on_reference_change(self.position_reference.get())
+
     def _on_reference_change(self, ref_type: str):
         """
         Handle reference radiobutton change.
@@ -360,60 +519,84 @@ class MainWindow:
             self.display_illustration("Position Reference")
         else:
             # For G55, G56, G57, show the G5x image
-            image_name = "G5x.png"
-            image_path = get_asset_path(image_name)
-            
-            if not PIL_AVAILABLE or not image_path.exists():
-                self.image_label.config(text="G-code Reference Position", fg="black")
-                return
-            
             try:
-                img = Image.open(image_path)
-                img.thumbnail((300, 200), Image.Resampling.LANCZOS)
-                self.current_photo_image = ImageTk.PhotoImage(img)
-                self.image_label.config(image=self.current_photo_image, text="")
+                photo = self._get_photo("G5x.png")
+                if photo is None:
+                    self._show_message("G-code Reference Position", "black")
+                    return
+                self._show_photo(photo)
             except Exception as e:
-                self.image_label.config(text=f"Error: {str(e)}", fg="red")
+                self._show_message(f"Error: {str(e)}", "red")
 
     def _on_only_finish_toggle(self):
         """Enable or disable roughing inputs based on Only finish checkbox."""
         enabled = not self.only_finish_var.get()
-        rough_widgets = [
-            self.roughing_tool,
-            self.roughing_diameter,
-            self.roughing_depth,
-            self.roughing_leave,
-            self.roughing_width,
-            self.roughing_rpm,
-            self.roughing_feedrate,
-        ]
-        for w in rough_widgets:
+        if enabled == self._rough_enabled:
+            return
+        self._rough_enabled = enabled
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for w in self._rough_widgets:
             try:
-                w.config(state=tk.NORMAL if enabled else tk.DISABLED)
+                w.config(state=state)
             except Exception:
                 pass
     
+    def _debounce_leave(self, event: tk.Event) -> None:
+        """Re-check Leave for Finishing once typing pauses, not on every key."""
+        if self._leave_after_id is not None:
+            self.root.after_cancel(self._leave_after_id)
+        self._leave_after_id = self.root.after(_LEAVE_DEBOUNCE_MS, self._on_leave_for_finishing_change)
+    
     def _on_leave_for_finishing_change(self):
         """Enable or disable finishing inputs based on Leave for Finishing value."""
+        self._leave_after_id = None
         try:
             value = float(self.roughing_leave.get())
         except Exception:
             return  # Invalid input, don't change state
         
         enabled = value != 0
-        finish_widgets = [
-            self.finishing_tool,
-            self.finishing_diameter,
-            self.finishing_width,
-            self.finishing_rpm,
-            self.finishing_feedrate,
-        ]
-        for w in finish_widgets:
+        if enabled == self._finish_enabled:
+            return
+        self._finish_enabled = enabled
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for w in self._finish_widgets:
             try:
-                w.config(state=tk.NORMAL if enabled else tk.DISABLED)
+                w.config(state=state)
             except Exception:
                 pass
     
+    def _get_photo(self, image_name: str,
+                   size: Tuple[int, int] = THUMBNAIL_SIZE) -> Union[tk.PhotoImage, "ImageTk.PhotoImage", None]:
+        """
+        Get an illustration resized to fit size, loading it on first use.
+        
+        See load_photo() for how the image is loaded and resized.
+        
+        Args:
+            image_name: Name of the image file (e.g., "X-pos.png")
+            size: Maximum (width, height) of the resized image
+            
+        Returns:
+            PhotoImage, or None if the image file does not exist or
+            cannot be read
+        """
+        key = (image_name, size)
+        photo = self._photo_cache.get(key)
+        if photo is not None:
+            self._photo_cache.move_to_end(key)
+            return photo
+        
+        photo = load_photo(self.root, find_asset_path(image_name), size,
+                           thumb_path=_THUMB_INDEX.get(image_name))
+        if photo is None:
+            return None
+        
+        self._photo_cache[key] = photo
+        if len(self._photo_cache) > _PHOTO_CACHE_SIZE:
+            self._photo_cache.popitem(last=False)
+        return photo
+    
     def display_illustration(self, field_name: str) -> None:
         """
         Display an illustration based on the focused field.
@@ -421,36 +604,25 @@ class MainWindow:
         Args:
             field_name: Name of the focused field
         """
-        if not PIL_AVAILABLE:
-            return
-        
-        # Get the image filename from the mapper
-        image_name = ImageMapper.get_image_for_field(field_name)
+        # Get the image filename and title from the mapper
+        meta = ImageMapper.get_meta(field_name)
         
-        if not image_name:
-            return
-        
-        image_path = get_asset_path(image_name)
-        
-        if not image_path.exists():
-            self.image_label.config(text=f"Image not found:\n{image_name}", fg="red")
+        if not meta:
             return
+        image_name, title = meta
         
         try:
-            img = Image.open(image_path)
+            photo = self._get_photo(image_name)
             
-            # Resize image to fit panel (max 300x200)
-            img.thumbnail((300, 200), Image.Resampling.LANCZOS)
-            
-            # Convert to PhotoImage
-            self.current_photo_image = ImageTk.PhotoImage(img)
+            if photo is None:
+                self._show_message(f"Image not found:\n{image_name}", "red")
+                return
             
-            # Update label with new image
-            title = ImageMapper.get_title_for_field(field_name)
-            self.image_label.config(image=self.current_photo_image, text="", fg="black")
+            # Swap the image on the canvas item
+            self._show_photo(photo)
             
         except Exception as e:
-            self.image_label.config(text=f"Error loading image:\n{str(e)}", fg="red")
+            self._show_message(f"Error loading image:\n{str(e)}", "red")
     
     def load_defaults(self) -> None:
         """Load default values from config."""
@@ -459,65 +631,21 @@ class MainWindow:
         # Load from "defaults" section
         defaults = config.get("defaults", {})
         
-        # Position
+        # Position reference
         pos = defaults.get("position", {})
         self.position_reference.set(pos.get("reference", "Table"))
-        self.position_x.delete(0, tk.END)
-        self.position_x.insert(0, str(pos.get("x", 0.0)))
-        self.position_y.delete(0, tk.END)
-        self.position_y.insert(0, str(pos.get("y", 0.0)))
         
-        # Stock
-        stock = defaults.get("stock", {})
-        self.stock_x.delete(0, tk.END)
-        self.stock_x.insert(0, str(stock.get("x_size", 100.0)))
-        self.stock_y.delete(0, tk.END)
-        self.stock_y.insert(0, str(stock.get("y_size", 100.0)))
-        self.stock_z.delete(0, tk.END)
-        self.stock_z.insert(0, str(stock.get("z_size", 50.0)))
-        self.stock_finished_z.delete(0, tk.END)
-        self.stock_finished_z.insert(0, str(stock.get("finished_z_height", 10.0)))
-        
-        # Roughing
-        rough = defaults.get("roughing", {})
-        self.roughing_tool.delete(0, tk.END)
-        self.roughing_tool.insert(0, str(rough.get("tool_number", 1)))
-        self.roughing_diameter.delete(0, tk.END)
-        self.roughing_diameter.insert(0, str(rough.get("tool_diameter", 10.0)))
-        self.roughing_depth.delete(0, tk.END)
-        self.roughing_depth.insert(0, str(rough.get("depth_of_cut", 5.0)))
-        self.roughing_leave.delete(0, tk.END)
-        self.roughing_leave.insert(0, str(rough.get("leave_for_finishing", 1.0)))
-        self.roughing_width.delete(0, tk.END)
-        self.roughing_width.insert(0, str(rough.get("width_of_cut", 20.0)))
-        self.roughing_rpm.delete(0, tk.END)
-        self.roughing_rpm.insert(0, str(rough.get("rpm", 5000)))
-        self.roughing_feedrate.delete(0, tk.END)
-        self.roughing_feedrate.insert(0, str(rough.get("feedrate", 1000)))
-        
-        # Finishing
-        finish = defaults.get("finishing", {})
-        self.finishing_tool.delete(0, tk.END)
-        self.finishing_tool.insert(0, str(finish.get("tool_number", 2)))
-        self.finishing_diameter.delete(0, tk.END)
-        self.finishing_diameter.insert(0, str(finish.get("tool_diameter", 10.0)))
-        self.finishing_width.delete(0, tk.END)
-        self.finishing_width.insert(0, str(finish.get("width_of_cut", 20.0)))
-        self.finishing_rpm.delete(0, tk.END)
-        self.finishing_rpm.insert(0, str(finish.get("rpm", 8000)))
-        self.finishing_feedrate.delete(0, tk.END)
-        self.finishing_feedrate.insert(0, str(finish.get("feedrate", 1500)))
+        # Entry fields
+        for attr_name, section, key, fallback in self.DEFAULT_VALUES:
+            entry = getattr(self, attr_name)
+            entry.delete(0, tk.END)
+            entry.insert(0, str(defaults.get(section, {}).get(key, fallback)))
 
         # Coolant - reset all checkboxes
         default_coolants = defaults.get("coolant", [])
         for coolant_name, var in self.coolant_vars.items():
             var.set(coolant_name in default_coolants)
-
-        # Stock offset
-        stock_defaults = defaults.get("stock", {})
-        # if stock_offset exists in defaults use it, otherwise 0
-        self.stock_offset.delete(0, tk.END)
-        self.stock_offset.insert(0, str(stock_defaults.get("stock_offset", 0)))
+        self._mark_coolant_dirty()
 
         # Only finish cut default and apply initial enabled/disabled state
         self.only_finish_var.set(defaults.get("only_finish", False))
@@ -527,18 +655,32 @@ class MainWindow:
         except Exception:
             pass
 
-        # Display default Home image
-        home_image = get_asset_path("Home_image.png")
-        if PIL_AVAILABLE and home_image.exists():
-            try:
-                img = Image.open(home_image)
-                img.thumbnail((300, 200), Image.Resampling.LANCZOS)
-                self.current_photo_image = ImageTk.PhotoImage(img)
-                self.image_label.config(image=self.current_photo_image, text="")
-            except Exception:
-                self.image_label.config(text="Home image error", fg="red")
-        else:
-            self.image_label.config(text="Home image not found", fg="gray")
+        # Display default Home image once the window has been drawn
+        self.root.after_idle(self._load_home_image)
+    
+    def _load_home_image(self) -> None:
+        """Display the default Home image in the illustration panel."""
+        try:
+            photo = self._get_photo("Home_image.png")
+            if photo is not None:
+                self._show_photo(photo)
+            else:
+                self._show_message("Home image not found", "gray")
+        except Exception:
+            self._show_message("Home image error", "red")
+    
+    def _refresh_config_cache(self) -> None:
+        """Re-read the config sections cached on the instance from the loaded config."""
+        self._coolant_options = self.config_manager.get_section("coolant_options")
+        # Machine settings snapshot, read again on the next POST
+        self._machine_settings = None
+        self._coolant_dirty = True
+    
+    def _get_machine_settings(self) -> Dict[str, Any]:
+        """Get the machine settings, read from config on first use and after Reset."""
+        if self._machine_settings is None:
+            self._machine_settings = self.config_manager.get_section("machine_settings")
+        return self._machine_settings
     
     def collect_parameters(self) -> Dict[str, Any]:
         """
@@ -547,51 +689,17 @@ class MainWindow:
         Returns:
             Dictionary with all parameters organized by section
         """
-        def to_float(s: str) -> float:
-            try:
-                return float(s)
-            except (ValueError, TypeError):
-                return 0.0
-        
-        def to_int(s: str) -> int:
-            try:
-                return int(s)
-            except (ValueError, TypeError):
-                return 0
-        
         parameters = {
-            "position": {
-                "reference": self.position_reference.get(),
-                "x": to_float(self.position_x.get()),
-                "y": to_float(self.position_y.get())
-            },
-            "stock": {
-                "x_size": to_float(self.stock_x.get()),
-                "y_size": to_float(self.stock_y.get()),
-                "z_size": to_float(self.stock_z.get()),
-                "finished_z_height": to_float(self.stock_finished_z.get()),
-                "stock_offset": to_int(self.stock_offset.get())
-            },
-            "roughing": {
-                "tool_number": to_int(self.roughing_tool.get()),
-                "tool_diameter": to_float(self.roughing_diameter.get()),
-                "depth_of_cut": to_float(self.roughing_depth.get()),
-                "leave_for_finishing": to_float(self.roughing_leave.get()),
-                "width_of_cut": to_float(self.roughing_width.get()),
-                "rpm": to_int(self.roughing_rpm.get()),
-                "feedrate": to_int(self.roughing_feedrate.get())
-            },
-            "finishing": {
-                "tool_number": to_int(self.finishing_tool.get()),
-                "tool_diameter": to_float(self.finishing_diameter.get()),
-                "width_of_cut": to_float(self.finishing_width.get()),
-                "rpm": to_int(self.finishing_rpm.get()),
-                "feedrate": to_int(self.finishing_feedrate.get())
-            },
-            "coolant": self._get_selected_coolants(),
-            "only_finish": self.only_finish_var.get(),
-            "machine_settings": self.config_manager.get_section("machine_settings")
+            "position": {"reference": self.position_reference.get()},
+            "stock": {},
+            "roughing": {},
+            "finishing": {},
         }
+        for section, key, entry, conv, default in self._param_schema:
+            parameters[section][key] = _to(conv, entry.get(), default)
+        parameters["coolant"] = self._get_selected_coolants()
+        parameters["only_finish"] = self.only_finish_var.get()
+        parameters["machine_settings"] = self._get_machine_settings()
         
         return parameters
     
@@ -605,31 +713,20 @@ class MainWindow:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        # Check for None values (empty inputs) in dictionary sections
-        def check_dict(d, section_name):
-            if not isinstance(d, dict):
-                return True, ""
-            for key, value in d.items():
-                if value is None:
-                    return False, f"Missing value in {section_name}: {key}"
-            return True, ""
-        
-        for section, data in parameters.items():
-            # Only validate dict sections (skip coolant, only_finish, machine_settings)
-            if section in ["position", "stock", "roughing", "finishing"]:
-                is_valid, msg = check_dict(data, section)
-                if not is_valid:
-                    return is_valid, msg
-        
-        # Additional validation
-        stock = parameters.get("stock", {})
-        if stock.get("z_size", 0) <= stock.get("finished_z_height", 0):
+        # collect_parameters() turns blank or invalid entries into 0, never None,
+        # so only the cross-field check is needed here; ranges are checked by
+        # InputValidator when the program is generated
+        stock = parameters["stock"]
+        if stock["z_size"] <= stock["finished_z_height"]:
             return False, "Z Size must be greater than Finished Z Height"
         
         return True, ""
     
     def post_program(self) -> None:
         """Handle POST PROGRAM button click."""
+        # Only one program is written at a time
+        if self._post_thread is not None:
+            return
         try:
             parameters = self.collect_parameters()
             
@@ -641,36 +738,79 @@ class MainWindow:
                 return
             
             # Generate G-code
-            generator = GCodeGenerator()
+            generator = self._generator
             # Set output_dir from config if available
-            ms = self.config_manager.get_section("machine_settings")
+            ms = self._get_machine_settings()
             out_dir = ms.get("output_path", ".")
             setattr(generator, 'output_dir', out_dir)
-            gcode_program = generator.generate_program(parameters)
+            # Validates now; the program itself is generated chunk by chunk
+            # while save_program() writes it out
+            gcode_program = generator.generate_program_stream(parameters)
             
             # Build filename from config
             program_name = ms.get("program_name", "program")
             append_timestamp = ms.get("append_timestamp", True)
             
             if append_timestamp:
-                timestamp = __import__('datetime').datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = datetime.now().strftime(_TS_FMT)
                 filename = f"{program_name}_{timestamp}"
             else:
                 filename = program_name
             
-            if generator.save_program(gcode_program, filename):
-                statusbar.set_status(f"Program saved: {filename}", level='success', timeout_ms=10000)
-            else:
-                statusbar.set_status("Failed to save program", level='error')
-        except ValueError as e:
-            statusbar.set_status(f"Error: {str(e)}", level='error')
-        except KeyError as e:
-            statusbar.set_status(f"Missing config key: {str(e)}", level='error')
+            # Generate and write the program off the Tk thread; _poll_post() reports the result
+            self.post_button.config(state=tk.DISABLED)
+            statusbar.set_status(f"Posting program: {filename}", level='info')
+            thread = threading.Thread(
+                target=self._do_post, args=(gcode_program, filename), name="post-program"
+            )
+            thread.start()
+            self._post_thread = thread
+            self.root.after(_POST_POLL_MS, self._poll_post, filename)
         except Exception as e:
-            statusbar.set_status(f"Unexpected error: {str(e)}", level='error')
+            # Leave POST usable again whatever step failed
+            self._post_thread = None
+            self.post_button.config(state=tk.NORMAL)
+            self._report_post_error(e)
+    
+    @staticmethod
+    def _report_post_error(error: Exception) -> None:
+        """Show an error raised while posting a program in the status bar."""
+        if isinstance(error, ValueError):
+            statusbar.set_status(f"Error: {str(error)}", level='error')
+        elif isinstance(error, KeyError):
+            statusbar.set_status(f"Missing config key: {str(error)}", level='error')
+        else:
+            statusbar.set_status(f"Unexpected error: {str(error)}", level='error')
+    
+    def _do_post(self, gcode_program: Iterator[str], filename: str) -> None:
+        """Write a program to disk (runs in a background thread; must not touch Tk)."""
+        self._post_saved = False
+        self._post_error = None
+        try:
+            self._post_saved = self._generator.save_program(gcode_program, filename)
+        except Exception as e:
+            self._post_error = e
+    
+    def _poll_post(self, filename: str) -> None:
+        """Report the background POST once it has finished, on the Tk thread."""
+        if self._post_thread.is_alive():
+            self.root.after(_POST_POLL_MS, self._poll_post, filename)
+            return
+        self._post_thread = None
+        self.post_button.config(state=tk.NORMAL)
+        if self._post_error is not None:
+            error, self._post_error = self._post_error, None
+            self._report_post_error(error)
+        elif self._post_saved:
+            statusbar.set_status(f"Program saved: {filename}", level='success', timeout_ms=10000)
+        else:
+            statusbar.set_status("Failed to save program", level='error')
     
     def reset_form(self) -> None:
         """Reset form to default values."""
+        # Pick up config.json edits made since the form was built or last reset
+        self.config_manager.load_config()
+        self._refresh_config_cache()
         self.load_defaults()
         statusbar.set_status("Form reset to default values", level='info', timeout_ms=5000)
 
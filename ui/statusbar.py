@@ -2,21 +2,42 @@
 Simple application-wide status bar helper.
 Register a Tk label from the main UI and call `set_status()` from anywhere.
 """
-from typing import Optional
+from typing import Optional, Tuple
 import tkinter as tk
+import weakref
 
-_status_label: Optional[tk.Label] = None
-_clear_job = None
+# Weak references, so a destroyed status bar is never kept alive by this module
+_status_label: Optional["weakref.ref[tk.Label]"] = None
+# Bumped on every status change; a timed clear only runs if its generation is still current
+_gen = 0
+_clear_pending = False
 _orig_bg = None
 _orig_fg = None
-_text_var_name: Optional[str] = None
-_tk_root = None
+# Variable behind the label's textvariable, if it has one
+_text_var: Optional["weakref.ref[tk.Variable]"] = None
+# Message and level currently shown, to skip updates that change nothing
+_last_message: Optional[str] = None
+_last_level: Optional[str] = None
+# Latest (message, timeout_ms, level) not shown yet; applied once per idle cycle
+_pending: Optional[Tuple[str, int, str]] = None
+_flush_scheduled = False
 
+# (bg, fg) per level; 'info' and unknown levels use the label's original colors
+_LEVEL_STYLES = {
+    'success': ('#d4edda', '#155724'),
+    'error': ('#f8d7da', '#721c24'),
+    'warning': ('#fff3cd', '#856404'),
+}
 
-def register(label: tk.Label) -> None:
-    """Register the Label widget to be used as the status bar and store original colors."""
-    global _status_label, _orig_bg, _orig_fg
-    _status_label = label
+
+def register(label: tk.Label, text_var: Optional[tk.Variable] = None) -> None:
+    """Register the Label widget to be used as the status bar and store original colors.
+
+    text_var: the label's textvariable, if the caller holds it; otherwise it is
+    looked up from the label once here
+    """
+    global _status_label, _orig_bg, _orig_fg, _text_var
+    _status_label = weakref.ref(label)
     try:
         _orig_bg = label.cget("bg")
         _orig_fg = label.cget("fg")
@@ -24,88 +45,149 @@ def register(label: tk.Label) -> None:
         _orig_bg = None
         _orig_fg = None
     # Capture associated textvariable (if any) so we can update it
-    try:
-        varname = label.cget('textvariable')
-        if varname:
-            global _text_var_name, _tk_root
-            _text_var_name = varname
-            _tk_root = label._root()
-    except Exception:
-        pass
+    if text_var is None:
+        try:
+            varname = str(label.cget('textvariable'))
+            if varname:
+                text_var = tk.StringVar(master=label._root(), name=varname)
+                # Only weakly referenced below; the label keeps the wrapper alive
+                label._status_text_var = text_var
+        except Exception:
+            pass
+    _text_var = weakref.ref(text_var) if text_var is not None else None
+    # Drop the references above when the label goes away
+    label.bind("<Destroy>", _on_destroy, add="+")
+
+
+def _get_label() -> Optional[tk.Label]:
+    """Get the registered status label, or None if there is none or it has been freed."""
+    return _status_label() if _status_label is not None else None
+
+
+def _set_text(message: str) -> None:
+    """Set the text variable of the status label, if it has one."""
+    text_var = _text_var() if _text_var is not None else None
+    if text_var is not None:
+        try:
+            text_var.set(message)
+        except Exception:
+            pass
+
+
+def _on_destroy(event: tk.Event) -> None:
+    """Release the destroyed status label and its variable; pending clears become no-ops."""
+    global _status_label, _text_var, _gen, _clear_pending, _last_message, _last_level
+    global _pending, _flush_scheduled
+    if event.widget is not _get_label():
+        return
+    _status_label = None
+    _text_var = None
+    _pending = None
+    _flush_scheduled = False
+    _gen += 1
+    _clear_pending = False
+    _last_message = None
+    _last_level = None
 
 
 def set_status(message: str, timeout_ms: int = 0, level: str = "info") -> None:
     """Set status bar text and color.
 
+    The label is updated when Tk next goes idle; if several statuses are set
+    before then, only the last one is applied.
+
     level: one of 'info', 'success', 'error', 'warning'
     """
-    global _status_label, _clear_job, _orig_bg, _orig_fg
-    if _status_label is None:
+    global _pending, _flush_scheduled
+    label = _get_label()
+    if label is None:
+        return
+    _pending = (message, timeout_ms, level)
+    if not _flush_scheduled:
+        _flush_scheduled = True
+        label.after_idle(_flush_status)
+
+
+def _flush_status() -> None:
+    """Apply the last status set since the previous idle cycle."""
+    global _pending, _flush_scheduled
+    _flush_scheduled = False
+    pending, _pending = _pending, None
+    if pending is not None:
+        _apply_status(*pending)
+
+
+def _apply_status(message: str, timeout_ms: int, level: str) -> None:
+    """Update the status label now."""
+    global _gen, _clear_pending, _last_message, _last_level
+    label = _get_label()
+    if label is None:
+        return
+    # Same message and level already shown, with no pending clear to cancel
+    if message == _last_message and level == _last_level and not timeout_ms and not _clear_pending:
         return
-    colors = {
-        'info': {'bg': _orig_bg or 'SystemButtonFace', 'fg': _orig_fg or 'black'},
-        'success': {'bg': '#d4edda', 'fg': '#155724'},
-        'error': {'bg': '#f8d7da', 'fg': '#721c24'},
-        'warning': {'bg': '#fff3cd', 'fg': '#856404'},
-    }
-    style = colors.get(level, colors['info'])
     # If label uses a textvariable, update that variable so StringVar reflects change.
     try:
-        if _text_var_name and _tk_root:
-            try:
-                _tk_root.setvar(_text_var_name, message)
-            except Exception:
-                pass
-        _status_label.config(bg=style['bg'], fg=style['fg'])
+        _set_text(message)
+        # Colours only change with the level
+        if level != _last_level:
+            bg, fg = _LEVEL_STYLES.get(level) or (_orig_bg or 'SystemButtonFace', _orig_fg or 'black')
+            label.config(bg=bg, fg=fg)
     except Exception:
         try:
-            _status_label.config(text=message)
+            label.config(text=message)
         except Exception:
             pass
+    _last_message = message
+    _last_level = level
 
-    # Cancel pending clear
-    try:
-        if _clear_job:
-            _status_label.after_cancel(_clear_job)
-    except Exception:
-        pass
-    _clear_job = None
+    # Any pending clear is now stale and aborts itself; no after_cancel needed
+    _gen += 1
+    _clear_pending = False
 
     if timeout_ms and timeout_ms > 0:
-        def _clear():
-            global _status_label, _clear_job, _orig_bg, _orig_fg, _text_var_name, _tk_root
-            if _status_label:
-                try:
-                    if _text_var_name and _tk_root:
-                        try:
-                            _tk_root.setvar(_text_var_name, "")
-                        except Exception:
-                            pass
-                    _status_label.config(text="", bg=_orig_bg or 'SystemButtonFace', fg=_orig_fg or 'black')
-                except Exception:
-                    try:
-                        _status_label.config(text="")
-                    except Exception:
-                        pass
-            _clear_job = None
-
-        _clear_job = _status_label.after(timeout_ms, _clear)
+        _clear_pending = True
+        label.after(timeout_ms, _clear_if_current, _gen)
 
 
-def clear() -> None:
-    """Clear the status bar immediately and restore original colors."""
-    global _status_label, _orig_bg, _orig_fg
-    if _status_label is None:
+def _clear_if_current(gen: int) -> None:
+    """Clear a timed status message unless a newer status replaced it."""
+    global _clear_pending, _last_message, _last_level
+    if gen != _gen:
         return
-    try:
-        if _text_var_name and _tk_root:
+    _clear_pending = False
+    label = _get_label()
+    if label is not None:
+        try:
+            _set_text("")
+            label.config(text="", bg=_orig_bg or 'SystemButtonFace', fg=_orig_fg or 'black')
+        except Exception:
             try:
-                _tk_root.setvar(_text_var_name, "")
+                label.config(text="")
             except Exception:
                 pass
-        _status_label.config(text="", bg=_orig_bg or 'SystemButtonFace', fg=_orig_fg or 'black')
+        _last_message = ""
+        _last_level = "info"
+
+
+def clear() -> None:
+    """Clear the status bar immediately and restore original colors."""
+    global _last_message, _last_level, _pending
+    label = _get_label()
+    if label is None:
+        return
+    # A status set earlier in this idle cycle must not reappear after the clear
+    _pending = None
+    # Already cleared
+    if _last_message == "" and _last_level == "info":
+        return
+    try:
+        _set_text("")
+        label.config(text="", bg=_orig_bg or 'SystemButtonFace', fg=_orig_fg or 'black')
     except Exception:
         try:
-            _status_label.config(text="")
+            label.config(text="")
         except Exception:
             pass
+    _last_message = ""
+    _last_level = "info"
@@ -2,9 +2,58 @@
 Custom TKinter widgets for numeric input fields with validation.
 """
 
+import re
 import tkinter as tk
+import weakref
+import tkinter.font as tkfont
 from tkinter import ttk
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
+
+# Partial numbers accepted while typing (e.g. "", "-", "+3.", ".5", "1e-"),
+# with the optional sign, exponent and surrounding spaces float()/int() allow
+_FLOAT_RE = re.compile(r"\s*[+-]?(?:\d*\.?\d*|(?:\d+\.?\d*|\.\d+)[eE][+-]?\d*)\s*")
+_INT_RE = re.compile(r"\s*[+-]?\d*\s*")
+
+
+def _validate_float(text: str) -> bool:
+    """Check that text is a (partial) float."""
+    return _FLOAT_RE.fullmatch(text) is not None
+
+
+def _validate_int(text: str) -> bool:
+    """Check that text is a (partial) integer."""
+    return _INT_RE.fullmatch(text) is not None
+
+
+def _validate_any(text: str) -> bool:
+    """Accept any text (unknown input type)."""
+    return True
+
+
+_VALIDATORS = {"float": _validate_float, "int": _validate_int}
+
+# NumericInputFrame per entry widget path, for the shared validatecommand and event bindings.
+# Weak values: a field whose widget is gone is dropped even if <Destroy> is never seen.
+_FIELDS: "weakref.WeakValueDictionary[str, NumericInputFrame]" = weakref.WeakValueDictionary()
+# Bind tag added to every NumericInputFrame entry; its bindings are made once per Tk root
+_BINDTAG = "NumericInput"
+
+# Named font for form labels and entries, shared with MainWindow
+SMALL_FONT = "FaceMillingSmall"
+
+
+def get_small_font(root: tk.Misc) -> tkfont.Font:
+    """
+    Get the shared small form font of a Tk root, creating it on first use.
+    
+    The font is created by name in Tcl, so it lives as long as the root's
+    interpreter and no Python reference keeps the root alive.
+    """
+    try:
+        return tkfont.nametofont(SMALL_FONT, root)
+    except tk.TclError:
+        root.tk.call("font", "create", SMALL_FONT, "-family", "Arial", "-size", 9)
+        return tkfont.nametofont(SMALL_FONT, root)
 
 
 class NumericInputFrame(tk.Frame):
@@ -13,6 +62,11 @@ class NumericInputFrame(tk.Frame):
     Handles both float and integer inputs.
     """
     
+    # Validation command and event bindings shared by all instances, set up once per Tk root
+    _vcmd: Optional[str] = None
+    # Weak reference to the root _vcmd is registered with, so a destroyed root is not kept alive
+    _vcmd_root: Optional["weakref.ref[tk.Misc]"] = None
+    
     def __init__(
         self,
         parent: tk.Widget,
@@ -39,68 +93,97 @@ class NumericInputFrame(tk.Frame):
         self.label_text = label_text
         self.input_type = input_type
         self.on_focus_callback = on_focus_callback
+        # Keystroke check and conversion for the input type, chosen once here
+        self._validator = _VALIDATORS.get(input_type, _validate_any)
+        self._convert = float if input_type == "float" else int
+        # State last applied by set_enabled(); widgets start enabled
+        self._enabled = True
+        # Entry text parsed by the validator after every accepted edit (None if empty/partial)
+        self._parsed_value: Union[float, int, None] = None
         
         # Create label
-        self.label = tk.Label(self, text=label_text, font=("Arial", 9))
+        root = self._root()
+        font = get_small_font(root)
+        self.label = ttk.Label(self, text=label_text, font=font)
         self.label.pack(side=tk.LEFT, padx=(0, 8))
         
-        # Create entry with validation
-        vcmd = self.register(self._validate_input)
-        self.entry = tk.Entry(
+        # Create entry with validation; the shared command finds this field by widget path
+        vcmd_root = NumericInputFrame._vcmd_root
+        if vcmd_root is None or vcmd_root() is not root:
+            NumericInputFrame._setup_root(root)
+        self.entry = ttk.Entry(
             self,
             width=width,
             validate="key",
-            validatecommand=(vcmd, "%S", "%P"),
-            font=("Arial", 9)
+            validatecommand=(NumericInputFrame._vcmd, "%W", "%P"),
+            font=font
         )
         self.entry.pack(side=tk.LEFT, padx=3)
+        _FIELDS[str(self.entry)] = self
         
-        # Bind focus events
-        self.entry.bind("<FocusIn>", self._on_focus_in)
-        self.entry.bind("<FocusOut>", self._on_focus_out)
+        # Focus-in and destroy events go through the shared class-level bindings
+        tags = self.entry.bindtags()
+        self.entry.bindtags(tags[:1] + (_BINDTAG,) + tags[1:])
         
         # Set default value if provided
         if default_value:
             self.set_value(default_value)
     
-    def _validate_input(self, char: str, new_value: str) -> bool:
+    @staticmethod
+    def _setup_root(root: tk.Misc) -> None:
+        """Register the shared validation command and bind the shared event handlers."""
+        NumericInputFrame._vcmd = root.register(NumericInputFrame._validate_input)
+        NumericInputFrame._vcmd_root = weakref.ref(root)
+        root.bind_class(_BINDTAG, "<FocusIn>", NumericInputFrame._dispatch_focus_in)
+        root.bind_class(_BINDTAG, "<Destroy>", NumericInputFrame._dispatch_destroy)
+    
+    @staticmethod
+    def _dispatch_focus_in(event: tk.Event) -> None:
+        """Route <FocusIn> to the NumericInputFrame owning the entry."""
+        field = _FIELDS.get(str(event.widget))
+        if field is not None:
+            field._on_focus_in(event)
+    
+    @staticmethod
+    def _dispatch_destroy(event: tk.Event) -> None:
+        """Forget a destroyed entry."""
+        _FIELDS.pop(str(event.widget), None)
+    
+    @staticmethod
+    def _validate_input(widget_path: str, new_value: str) -> bool:
         """
         Validate input based on input type.
         
         Args:
-            char: The character being inserted
+            widget_path: Tk path of the entry being edited
             new_value: The new complete value of the entry
             
         Returns:
             True if valid, False otherwise
         """
-        # Allow empty string
-        if new_value == "":
+        field = _FIELDS.get(widget_path)
+        if field is None:
             return True
+        return field._accept(new_value)
+    
+    def _accept(self, new_value: str) -> bool:
+        """Check an edit against the input type and cache its parsed value if accepted."""
+        if not self._validator(new_value):
+            return False
+        self._parsed_value = self._parse(new_value)
+        return True
+    
+    def _parse(self, text: str) -> Union[float, int, None]:
+        """Convert entry text to the input type, or None if empty or incomplete."""
+        value = text.strip()
         
-        if self.input_type == "float":
-            try:
-                if new_value.count(".") > 1:
-                    return False
-                if new_value.count("-") > 1:
-                    return False
-                if new_value != "" and new_value != "-" and new_value != ".":
-                    float(new_value)
-                return True
-            except ValueError:
-                return False
-        
-        elif self.input_type == "int":
-            try:
-                if new_value.count("-") > 1:
-                    return False
-                if new_value != "" and new_value != "-":
-                    int(new_value)
-                return True
-            except ValueError:
-                return False
+        if value == "":
+            return None
         
-        return True
+        try:
+            return self._convert(value)
+        except ValueError:
+            return None
     
     def _on_focus_in(self, event):
         """Handle focus in event."""
@@ -108,10 +191,6 @@ class NumericInputFrame(tk.Frame):
             # Call the callback with the label text as parameter
             self.on_focus_callback(self.label_text)
     
-    def _on_focus_out(self, event):
-        """Handle focus out event."""
-        pass
-    
     def get_value(self):
         """
         Get the value from the entry.
@@ -119,23 +198,17 @@ class NumericInputFrame(tk.Frame):
         Returns:
             Converted value (float or int), or None if empty
         """
-        value = self.entry.get().strip()
-        
-        if value == "":
-            return None
-        
-        try:
-            if self.input_type == "float":
-                return float(value)
-            else:
-                return int(value)
-        except ValueError:
-            return None
+        # Parsed by the validator whenever the text changed
+        return self._parsed_value
     
     def set_value(self, value):
         """Set the value in the entry."""
+        text = str(value)
+        # Unchanged: skip the delete/insert and the validation they trigger
+        if text == self.entry.get():
+            return
         self.entry.delete(0, tk.END)
-        self.entry.insert(0, str(value))
+        self.entry.insert(0, text)
     
     def get_raw_value(self) -> str:
         """Get the raw string value from the entry."""
@@ -143,10 +216,13 @@ class NumericInputFrame(tk.Frame):
 
     def set_enabled(self, enabled: bool) -> None:
         """Enable or disable the input control visually and functionally."""
+        if enabled == self._enabled:
+            return
+        self._enabled = enabled
         state = 'normal' if enabled else 'disabled'
         fg = 'black' if enabled else 'gray'
         try:
             self.entry.config(state=state)
-            self.label.config(fg=fg)
+            self.label.config(foreground=fg)
         except Exception:
             pass